@@ -0,0 +1,109 @@
+"""
+Multi-dimensional attrition cube over the employee table.
+
+cube_statement() groups by any subset of CUBE_DIMENSIONS with optional
+equality filters and counts employees and leavers in one SQL pass.
+Results are cached per (dimensions, filters); the employee write
+endpoints call invalidate_cube_cache(), and CUBE_CACHE_TTL bounds how
+stale another worker process can be.
+"""
+import os
+from typing import Dict, List, Sequence
+
+from sqlalchemy import Integer
+from sqlmodel import Session, select, func, case
+
+from app.cache import LRUTTLCache
+from app.models.employee import Employee
+from app.analytics.queries import salary_bucket
+
+CUBE_CACHE_SIZE = int(os.getenv("CUBE_CACHE_SIZE", "256"))
+CUBE_CACHE_TTL = float(os.getenv("CUBE_CACHE_TTL", "60"))
+
+# Categorical employee columns that can be used as dimensions or filters,
+# plus the derived salary_range bucket
+CUBE_DIMENSIONS = {
+    "department": Employee.department,
+    "job_role": Employee.job_role,
+    "job_level": Employee.job_level,
+    "over_time": Employee.over_time,
+    "marital_status": Employee.marital_status,
+    "business_travel": Employee.business_travel,
+    "gender": Employee.gender,
+    "education": Employee.education,
+    "education_field": Employee.education_field,
+    "environment_satisfaction": Employee.environment_satisfaction,
+    "job_involvement": Employee.job_involvement,
+    "job_satisfaction": Employee.job_satisfaction,
+    "performance_rating": Employee.performance_rating,
+    "relationship_satisfaction": Employee.relationship_satisfaction,
+    "stock_option_level": Employee.stock_option_level,
+    "work_life_balance": Employee.work_life_balance,
+    "salary_range": None,
+}
+
+_cube_cache = LRUTTLCache(CUBE_CACHE_SIZE, CUBE_CACHE_TTL)
+
+
+def parse_filter(dimension: str, raw: str) -> List:
+    """Comma-separated filter values, converted to the column's Python type"""
+    values = [value.strip() for value in raw.split(",") if value.strip()]
+    column = CUBE_DIMENSIONS[dimension]
+    if column is not None and isinstance(column.type, Integer):
+        return [int(value) for value in values]
+    return values
+
+
+def cube_statement(dimensions: Sequence[str], filters: Dict[str, List]):
+    """GROUP BY `dimensions` over employees matching `filters` (value IN list)"""
+    needed = list(dict.fromkeys([*dimensions, *filters]))
+    columns = [
+        salary_bucket().label(name) if name == "salary_range" else CUBE_DIMENSIONS[name].label(name)
+        for name in needed
+    ]
+    # Select the dimensions in a subquery so GROUP BY and WHERE only see
+    # plain columns (PostgreSQL rejects a repeated, re-bound CASE)
+    base = select(*columns, Employee.attrition).subquery()
+
+    group_columns = [base.c[name] for name in dimensions]
+    statement = select(
+        *group_columns,
+        func.count(),
+        func.sum(case((base.c.attrition == "Yes", 1), else_=0)),
+    )
+    for name, values in filters.items():
+        statement = statement.where(base.c[name].in_(values))
+    if group_columns:
+        statement = statement.group_by(*group_columns).order_by(*group_columns)
+    return statement
+
+
+def compute_cube(session: Session, dimensions: Sequence[str], filters: Dict[str, List]) -> List[dict]:
+    """Cube cells for `dimensions`/`filters`, served from cache when possible"""
+    key = (tuple(dimensions), tuple(sorted((name, tuple(values)) for name, values in filters.items())))
+    cells = _cube_cache.get(key)
+    if cells is not None:
+        return cells
+
+    cells = []
+    for row in session.exec(cube_statement(dimensions, filters)):
+        *groups, total, attrition = row
+        attrition = attrition or 0
+        cell = dict(zip(dimensions, groups))
+        cell.update({
+            "total": total,
+            "attrition": attrition,
+            "attritionRate": round(attrition / total * 100, 2) if total else 0,
+        })
+        cells.append(cell)
+    _cube_cache.set(key, cells)
+    return cells
+
+
+def invalidate_cube_cache() -> None:
+    """Drop cached cube results after employee data changes"""
+    _cube_cache.clear()
+
+
+def cube_cache_stats() -> dict:
+    return _cube_cache.stats()
@@ -0,0 +1,149 @@
+"""
+Prediction rollups and retention.
+
+prediction_rollup keeps prediction counts per day and per week (weeks
+start on Monday) and risk level. PredictionWriter adds each batch it
+writes to the rollups in the same transaction, so rollup queries never
+touch the raw prediction table. Because the rollups already cover every
+raw row, compact_predictions() can delete raw rows past the retention
+window without losing them from the rollups.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlmodel import Session, select, delete, func, case
+
+from app.db.engine import upsert_insert
+from app.models.prediction import Prediction
+from app.models.prediction_rollup import PredictionRollup
+
+GRANULARITIES = ("day", "week")
+
+
+def period_start(day: date, granularity: str) -> date:
+    """First day of the period `day` falls in"""
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def rollup_deltas(rows: Iterable[dict]) -> Dict[tuple, list]:
+    """{(granularity, period_start, risk_level): [count, predicted_leaving, probability_sum]}"""
+    deltas = defaultdict(lambda: [0, 0, 0.0])
+    for row in rows:
+        day = row["created_at"].date()
+        leaving = 1 if row["prediction"] == "Yes" else 0
+        for granularity in GRANULARITIES:
+            delta = deltas[(granularity, period_start(day, granularity), row["risk_level"] or "Unknown")]
+            delta[0] += 1
+            delta[1] += leaving
+            delta[2] += row["probability"]
+    return deltas
+
+
+def apply_rollup(session: Session, deltas: Dict[tuple, list]) -> None:
+    """
+    Add deltas to the rollup rows in the caller's transaction with one
+    executemany INSERT ... ON CONFLICT DO UPDATE, so writers in several
+    processes can create the same new period without a unique violation
+    """
+    if not deltas:
+        return
+    statement = upsert_insert(session, PredictionRollup.__table__)
+    statement = statement.on_conflict_do_update(
+        index_elements=["granularity", "period_start", "risk_level"],
+        set_={
+            "count": statement.table.c.count + statement.excluded.count,
+            "predicted_leaving": statement.table.c.predicted_leaving + statement.excluded.predicted_leaving,
+            "probability_sum": statement.table.c.probability_sum + statement.excluded.probability_sum,
+        },
+    )
+    session.connection().execute(statement, [
+        {"granularity": granularity, "period_start": start, "risk_level": risk,
+         "count": count, "predicted_leaving": leaving, "probability_sum": probability_sum}
+        for (granularity, start, risk), (count, leaving, probability_sum) in deltas.items()
+    ])
+
+
+def read_rollup(
+    session: Session,
+    granularity: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> List[dict]:
+    """Rollup rows for periods starting in [start, end), oldest first"""
+    query = select(PredictionRollup).where(PredictionRollup.granularity == granularity)
+    if start is not None:
+        query = query.where(PredictionRollup.period_start >= period_start(start, granularity))
+    if end is not None:
+        query = query.where(PredictionRollup.period_start < end)
+    query = query.order_by(PredictionRollup.period_start, PredictionRollup.risk_level)
+    return [
+        {
+            "periodStart": row.period_start,
+            "riskLevel": row.risk_level,
+            "count": row.count,
+            "predictedLeaving": row.predicted_leaving,
+            "averageProbability": round(row.probability_sum / row.count, 4) if row.count else None,
+        }
+        for row in session.exec(query)
+    ]
+
+
+def rebuild_rollups(session: Session) -> int:
+    """
+    Recompute the rollups from the raw prediction table; returns rows
+    written. Only exact while no raw rows have been compacted away.
+    """
+    session.exec(delete(PredictionRollup))
+    day = func.date(Prediction.created_at)
+    daily = session.exec(
+        select(
+            day,
+            Prediction.risk_level,
+            func.count(Prediction.id),
+            func.sum(case((Prediction.prediction == "Yes", 1), else_=0)),
+            func.sum(Prediction.probability),
+        ).group_by(day, Prediction.risk_level)
+    ).all()
+
+    deltas = defaultdict(lambda: [0, 0, 0.0])
+    for raw_day, risk, count, leaving, probability_sum in daily:
+        day_value = raw_day if isinstance(raw_day, date) else date.fromisoformat(raw_day)
+        for granularity in GRANULARITIES:
+            delta = deltas[(granularity, period_start(day_value, granularity), risk or "Unknown")]
+            delta[0] += count
+            delta[1] += leaving or 0
+            delta[2] += probability_sum or 0.0
+    apply_rollup(session, deltas)
+    session.commit()
+    return len(deltas)
+
+
+def ensure_rollups(session: Session) -> None:
+    """Build the rollups on first start against a database that already has predictions"""
+    has_rollups = session.exec(select(func.count()).select_from(PredictionRollup)).one()
+    has_predictions = session.exec(select(func.count(Prediction.id))).one()
+    if not has_rollups and has_predictions:
+        rebuild_rollups(session)
+
+
+def compact_predictions(session: Session, older_than: datetime, batch_size: int = 10000) -> int:
+    """
+    Delete raw predictions created before `older_than`, batch by batch;
+    their counts stay in the rollups. Returns the number of rows deleted.
+    """
+    deleted = 0
+    while True:
+        ids = session.exec(
+            select(Prediction.id)
+            .where(Prediction.created_at < older_than)
+            .order_by(Prediction.created_at, Prediction.id)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            return deleted
+        session.exec(delete(Prediction).where(Prediction.id.in_(ids)))
+        session.commit()
+        deleted += len(ids)
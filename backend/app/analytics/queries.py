@@ -0,0 +1,93 @@
+from typing import Optional
+
+from sqlmodel import select, func, case
+
+from app.models.employee import Employee
+
+
+# Monthly income buckets: (min inclusive, max exclusive or None, label)
+SALARY_RANGES = [
+    (0, 30000, "0-30k"),
+    (30000, 60000, "30k-60k"),
+    (60000, 90000, "60k-90k"),
+    (90000, 120000, "90k-120k"),
+    (120000, None, "120k+"),
+]
+
+
+def attrition_count():
+    """SUM(CASE ...) counting employees who left"""
+    return func.sum(case((Employee.attrition == "Yes", 1), else_=0))
+
+
+def salary_bucket():
+    """CASE expression mapping monthly_income to its SALARY_RANGES label"""
+    income = func.coalesce(Employee.monthly_income, 0)
+    whens = []
+    for min_sal, max_sal, label in SALARY_RANGES:
+        condition = income >= min_sal if max_sal is None else (income >= min_sal) & (income < max_sal)
+        whens.append((condition, label))
+    return case(*whens, else_=None)
+
+
+def department_statement():
+    return (
+        select(Employee.department, func.count(Employee.id), attrition_count())
+        .group_by(Employee.department)
+    )
+
+
+def role_statement():
+    return (
+        select(Employee.job_role, func.count(Employee.id), attrition_count())
+        .group_by(Employee.job_role)
+    )
+
+
+def salary_statement():
+    # Bucket in a subquery so GROUP BY refers to a plain column; repeating
+    # the CASE with its own bound parameters is rejected by PostgreSQL
+    bucketed = select(
+        salary_bucket().label("bucket"),
+        Employee.id,
+        Employee.attrition,
+    ).subquery()
+    return (
+        select(
+            bucketed.c.bucket,
+            func.count(bucketed.c.id),
+            func.sum(case((bucketed.c.attrition == "Yes", 1), else_=0)),
+        )
+        .where(bucketed.c.bucket.is_not(None))
+        .group_by(bucketed.c.bucket)
+    )
+
+
+def group_counts(rows) -> dict:
+    """{group: (total, attrition)} from GROUP BY rows, with NULL groups as Unknown"""
+    counts = {}
+    for group, total, attrition in rows:
+        group = group or "Unknown"
+        prev_total, prev_attrition = counts.get(group, (0, 0))
+        counts[group] = (prev_total + total, prev_attrition + (attrition or 0))
+    return counts
+
+
+def dashboard_statement():
+    """All dashboard figures in one round trip via conditional aggregation"""
+    return select(
+        func.count(Employee.id),
+        attrition_count(),
+        func.avg(Employee.age),
+        func.avg(Employee.monthly_income),
+        func.avg(Employee.job_satisfaction),
+    )
+
+
+def salary_label(monthly_income: Optional[int]) -> Optional[str]:
+    """Python twin of salary_bucket() for a single employee"""
+    income = monthly_income or 0
+    for min_sal, max_sal, label in SALARY_RANGES:
+        if income >= min_sal and (max_sal is None or income < max_sal):
+            return label
+    return None
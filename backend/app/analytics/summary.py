@@ -0,0 +1,129 @@
+"""
+Materialized analytics snapshot.
+
+The analytics_summary table keeps employee and attrition counts per
+department, job role and salary range. The employee CRUD handlers call
+record_change() in the same transaction as their write so the counts
+stay exact, and the /api/analytics breakdowns read O(groups) rows from
+here instead of scanning the employee table. rebuild_summary() recomputes
+everything from scratch (see scripts/rebuild_analytics.py).
+"""
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlmodel import Session, select, delete, func
+
+from app.db.engine import upsert_insert
+from app.models.analytics_summary import AnalyticsSummary
+from app.models.employee import Employee
+from app.analytics.queries import (
+    department_statement,
+    role_statement,
+    salary_statement,
+    group_counts,
+    salary_label,
+)
+
+# Employee fields that decide which summary rows an employee counts towards
+SUMMARY_FIELDS = ("department", "job_role", "monthly_income", "attrition")
+
+# dimension -> GROUP BY statement used for a full rebuild
+SUMMARY_STATEMENTS = {
+    "department": department_statement,
+    "job_role": role_statement,
+    "salary_range": salary_statement,
+}
+
+
+def summary_values(employee) -> dict:
+    """Snapshot of the SUMMARY_FIELDS of an Employee, taken before a change"""
+    return {field: getattr(employee, field, None) for field in SUMMARY_FIELDS}
+
+
+def employee_buckets(values: dict) -> Iterable[Tuple[str, str]]:
+    """The (dimension, bucket) rows one employee counts towards"""
+    yield "department", values.get("department") or "Unknown"
+    yield "job_role", values.get("job_role") or "Unknown"
+    salary_range = salary_label(values.get("monthly_income"))
+    if salary_range is not None:
+        yield "salary_range", salary_range
+
+
+def summary_deltas(before: Iterable[dict] = (), after: Iterable[dict] = ()) -> Dict[tuple, list]:
+    """Net (total, attrition) change per summary row for a set of employee changes"""
+    deltas = {}
+    for sign, snapshots in ((-1, before), (1, after)):
+        for values in snapshots:
+            left = 1 if values.get("attrition") == "Yes" else 0
+            for key in employee_buckets(values):
+                delta = deltas.setdefault(key, [0, 0])
+                delta[0] += sign
+                delta[1] += sign * left
+    return {key: delta for key, delta in deltas.items() if delta != [0, 0]}
+
+
+def apply_deltas(session: Session, deltas: Dict[tuple, list]) -> None:
+    """
+    Add deltas to the summary rows in the caller's transaction with one
+    INSERT ... ON CONFLICT DO UPDATE, so concurrent writers creating the
+    same new group both succeed
+    """
+    if not deltas:
+        return
+    statement = upsert_insert(session, AnalyticsSummary.__table__)
+    statement = statement.on_conflict_do_update(
+        index_elements=["dimension", "bucket"],
+        set_={
+            "total": statement.table.c.total + statement.excluded.total,
+            "attrition": statement.table.c.attrition + statement.excluded.attrition,
+        },
+    )
+    session.connection().execute(statement, [
+        {"dimension": dimension, "bucket": bucket, "total": total, "attrition": attrition}
+        for (dimension, bucket), (total, attrition) in deltas.items()
+    ])
+
+
+def record_change(session: Session, before: Optional[dict] = None, after: Optional[dict] = None) -> None:
+    """
+    Update the summary for one employee being created (before=None),
+    updated, or deleted (after=None). Values come from summary_values().
+    """
+    apply_deltas(session, summary_deltas(
+        [before] if before else [],
+        [after] if after else [],
+    ))
+
+
+def summary_statement(dimension: str):
+    return (
+        select(AnalyticsSummary.bucket, AnalyticsSummary.total, AnalyticsSummary.attrition)
+        .where(AnalyticsSummary.dimension == dimension, AnalyticsSummary.total > 0)
+    )
+
+
+def read_summary(session: Session, dimension: str) -> Dict[str, Tuple[int, int]]:
+    """{bucket: (total, attrition)} for one dimension, skipping empty groups"""
+    rows = session.exec(summary_statement(dimension))
+    return {bucket: (total, attrition) for bucket, total, attrition in rows}
+
+
+def rebuild_summary(session: Session) -> int:
+    """Recompute every summary row from the employee table; returns rows written"""
+    session.exec(delete(AnalyticsSummary))
+    written = 0
+    for dimension, build in SUMMARY_STATEMENTS.items():
+        for bucket, (total, attrition) in group_counts(session.exec(build())).items():
+            session.add(AnalyticsSummary(
+                dimension=dimension, bucket=bucket, total=total, attrition=attrition
+            ))
+            written += 1
+    session.commit()
+    return written
+
+
+def ensure_summary(session: Session) -> None:
+    """Build the snapshot on first start against an already-populated database"""
+    has_summary = session.exec(select(func.count()).select_from(AnalyticsSummary)).one()
+    has_employees = session.exec(select(func.count(Employee.id))).one()
+    if not has_summary and has_employees:
+        rebuild_summary(session)
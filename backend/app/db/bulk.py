@@ -0,0 +1,321 @@
+"""
+Bulk employee writes.
+
+upsert_employees() writes a DataFrame of employees in batches, updating
+rows whose employee_number already exists and inserting the rest. It uses
+executemany Core statements, and on PostgreSQL (psycopg2) streams the
+file through COPY into a temporary table followed by one set-based UPDATE
+and one INSERT. The analytics snapshot and search index are adjusted for
+the touched rows only, in the same transaction.
+
+update_employees() and delete_employees() apply many patches or deletes
+in a single transaction with set-based SQL, keeping the analytics
+snapshot and search index in step.
+"""
+import io
+import time
+from typing import TYPE_CHECKING, BinaryIO, Dict, List, Optional
+
+from sqlalchemy import Integer
+from sqlmodel import Session, select, delete, text, bindparam
+
+from app.models.employee import Employee
+from app.analytics.summary import (
+    SUMMARY_FIELDS,
+    apply_deltas,
+    summary_deltas,
+)
+from app.analytics.cube import invalidate_cube_cache
+from app.db.search import (
+    SEARCH_FIELDS,
+    index_employees,
+    unindex_employees,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+BULK_BATCH_SIZE = 5000
+
+# Every writable employee column, in table order
+EMPLOYEE_COLUMNS = [column.name for column in Employee.__table__.columns if column.name != "id"]
+INTEGER_COLUMNS = {
+    column.name for column in Employee.__table__.columns
+    if isinstance(column.type, Integer) and column.name != "id"
+}
+
+
+def normalize_columns(df: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    Make an employee file match the employee table: PascalCase headers
+    become snake_case (EmployeeNumber -> employee_number), unknown columns
+    are dropped and blanks/NA become NULL.
+    """
+    import pandas as pd
+
+    df = df.copy()
+    df.columns = df.columns.str.replace(r'(?<!^)(?=[A-Z])', '_', regex=True).str.lower()
+    df = df.rename(columns={"over18": "over_18"})
+    df = df.loc[:, ~df.columns.duplicated()]
+    df = df[[column for column in EMPLOYEE_COLUMNS if column in df.columns]]
+    df = df.replace({"": None, "NA": None})
+
+    for column in df.columns:
+        if column in INTEGER_COLUMNS:
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype("Int64")
+    return df.astype(object).where(df.notna(), None)
+
+
+def read_employee_file(source: BinaryIO, filename: str) -> "pd.DataFrame":
+    """Read a CSV or Parquet employee file and normalize its columns"""
+    import pandas as pd
+
+    if filename.endswith(".parquet"):
+        df = pd.read_parquet(source)  # needs pyarrow or fastparquet
+    elif filename.endswith(".csv"):
+        df = pd.read_csv(source)
+    else:
+        raise ValueError("Only .csv and .parquet files are accepted")
+    return normalize_columns(df)
+
+
+def upsert_employees(session: Session, df: "pd.DataFrame", batch_size: int = BULK_BATCH_SIZE) -> dict:
+    """
+    Insert or update (matched on employee_number) every row of a normalized
+    employee DataFrame. The analytics snapshot and search index are
+    adjusted for the touched rows and everything commits together.
+    """
+    import pandas as pd
+
+    start = time.perf_counter()
+    if "age" not in df.columns or df["age"].isna().any():
+        raise ValueError("Every employee needs an age")
+
+    # The last row wins when a file repeats an employee_number
+    if "employee_number" in df.columns:
+        numbered = df["employee_number"].notna()
+        df = pd.concat([
+            df[numbered].drop_duplicates("employee_number", keep="last"),
+            df[~numbered],
+        ])
+
+    if session.get_bind().dialect.name == "postgresql" and _supports_copy(session):
+        inserted_ids, before = _copy_upsert(session, df)
+    else:
+        inserted_ids, before = _batched_upsert(session, df, batch_size)
+
+    touched = list(before) + inserted_ids
+    after = _load_snapshots(session, touched)
+    apply_deltas(session, summary_deltas(before.values(), after.values()))
+    for chunk in _chunks(touched):
+        index_employees(session, session.exec(select(Employee).where(Employee.id.in_(chunk))).all())
+
+    session.commit()
+    invalidate_cube_cache()
+
+    return {
+        "total": len(df),
+        "inserted": len(inserted_ids),
+        "updated": len(before),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def _records(df: "pd.DataFrame") -> list:
+    """Row dicts built column-wise; much cheaper than DataFrame.to_dict for object frames"""
+    columns = list(df.columns)
+    values = [df[column].tolist() for column in columns]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def _batched_upsert(session: Session, df: "pd.DataFrame", batch_size: int):
+    """
+    Write the rows with executemany statements. Returns the ids of the
+    inserted rows and {id: summary_values} of the updated ones as they were
+    before the update.
+    """
+    inserted_ids, before = [], {}
+    records = _records(df)
+    table = Employee.__table__
+    connection = session.connection()
+    insert_rows = table.insert().returning(table.c.id, sort_by_parameter_order=True)
+    update_rows = (
+        table.update()
+        .where(table.c.id == bindparam("_id"))
+        .values({column: bindparam(column) for column in df.columns})
+    )
+    for offset in range(0, len(records), batch_size):
+        batch = records[offset:offset + batch_size]
+
+        numbers = [row["employee_number"] for row in batch if row.get("employee_number") is not None]
+        existing = {}
+        if numbers:
+            existing = dict(session.exec(
+                select(Employee.employee_number, Employee.id)
+                .where(Employee.employee_number.in_(numbers))
+            ).all())
+
+        new_rows, changed_rows = [], []
+        for row in batch:
+            emp_id = existing.get(row.get("employee_number"))
+            if emp_id is None:
+                new_rows.append(row)
+            else:
+                changed_rows.append({"_id": emp_id, **row})
+
+        # Core executemany statements, bypassing per-row ORM bookkeeping
+        if new_rows:
+            inserted_ids += connection.execute(insert_rows, new_rows).scalars().all()
+        if changed_rows:
+            before.update(_load_snapshots(session, [row["_id"] for row in changed_rows]))
+            connection.execute(update_rows, changed_rows)
+    return inserted_ids, before
+
+
+def _supports_copy(session: Session) -> bool:
+    raw = session.connection().connection.dbapi_connection
+    return hasattr(raw.cursor(), "copy_expert")
+
+
+def _copy_upsert(session: Session, df: "pd.DataFrame"):
+    """COPY counterpart of _batched_upsert, with the same return value"""
+    columns = list(df.columns)
+    column_list = ", ".join(columns)
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False, na_rep="")
+    buffer.seek(0)
+
+    session.exec(text(
+        f"CREATE TEMP TABLE employee_import ON COMMIT DROP AS "
+        f"SELECT {column_list} FROM employee WITH NO DATA"
+    ))
+    raw = session.connection().connection.dbapi_connection
+    with raw.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY employee_import ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '')",
+            buffer,
+        )
+
+    before = {}
+    if "employee_number" in columns:
+        assignments = ", ".join(f"{column} = i.{column}" for column in columns if column != "employee_number")
+        matched = (
+            "FROM employee_import i "
+            "WHERE i.employee_number IS NOT NULL AND e.employee_number = i.employee_number"
+        )
+        summary_columns = ", ".join(f"e.{field}" for field in SUMMARY_FIELDS)
+        existing = session.exec(text(
+            f"SELECT e.id, {summary_columns} FROM employee e "
+            f"JOIN employee_import i ON e.employee_number = i.employee_number"
+        ))
+        for emp_id, *values in existing:
+            before[emp_id] = dict(zip(SUMMARY_FIELDS, values))
+        if assignments:
+            session.exec(text(f"UPDATE employee e SET {assignments} {matched}"))
+        missing = (
+            "WHERE i.employee_number IS NULL OR NOT EXISTS "
+            "(SELECT 1 FROM employee e WHERE e.employee_number = i.employee_number)"
+        )
+    else:
+        missing = ""
+    inserted_ids = session.exec(text(
+        f"INSERT INTO employee ({column_list}) SELECT {column_list} FROM employee_import i {missing} "
+        f"RETURNING id"
+    )).scalars().all()
+    return inserted_ids, before
+
+
+def _chunks(values: list, size: int = BULK_BATCH_SIZE):
+    for offset in range(0, len(values), size):
+        yield values[offset:offset + size]
+
+
+def _load_snapshots(session: Session, ids: List[int]) -> Dict[int, dict]:
+    """{id: summary_values} for the employees that exist among `ids`"""
+    columns = [getattr(Employee, field) for field in SUMMARY_FIELDS]
+    snapshots = {}
+    for chunk in _chunks(ids):
+        for emp_id, *values in session.exec(select(Employee.id, *columns).where(Employee.id.in_(chunk))):
+            snapshots[emp_id] = dict(zip(SUMMARY_FIELDS, values))
+    return snapshots
+
+
+def update_employees(session: Session, patches: List[dict]) -> List[dict]:
+    """
+    Apply partial updates ({"id": ..., field: value, ...}) in one
+    transaction. Patches with the same set of fields share one executemany
+    UPDATE; the analytics snapshot and search index are adjusted in the same
+    transaction. Returns a status per patch.
+    """
+    # Later patches for the same id win, field by field
+    merged: Dict[int, dict] = {}
+    for patch in patches:
+        merged.setdefault(patch["id"], {}).update({k: v for k, v in patch.items() if k != "id"})
+
+    before = _load_snapshots(session, list(merged))
+    table = Employee.__table__
+    groups: Dict[tuple, list] = {}
+    for emp_id, fields in merged.items():
+        if emp_id in before and fields:
+            groups.setdefault(tuple(sorted(fields)), []).append({"_id": emp_id, **fields})
+
+    connection = session.connection()
+    for fields, rows in groups.items():
+        statement = (
+            table.update()
+            .where(table.c.id == bindparam("_id"))
+            .values({field: bindparam(field) for field in fields})
+        )
+        connection.execute(statement, rows)
+
+    changed = [emp_id for emp_id in before if merged[emp_id]]
+    after = [{**before[emp_id], **{
+        field: value for field, value in merged[emp_id].items() if field in SUMMARY_FIELDS
+    }} for emp_id in changed]
+    apply_deltas(session, summary_deltas([before[emp_id] for emp_id in changed], after))
+
+    reindex = [emp_id for emp_id in changed if any(field in merged[emp_id] for field in SEARCH_FIELDS)]
+    for chunk in _chunks(reindex):
+        index_employees(session, session.exec(select(Employee).where(Employee.id.in_(chunk))).all())
+
+    session.commit()
+    invalidate_cube_cache()
+
+    def status(emp_id: int) -> str:
+        if emp_id not in before:
+            return "not_found"
+        return "updated" if merged[emp_id] else "unchanged"
+
+    return [{"id": patch["id"], "status": status(patch["id"])} for patch in patches]
+
+
+def delete_employees(session: Session, ids: Optional[List[int]] = None, filters=()) -> List[dict]:
+    """
+    Delete employees by id, by filter expressions, or both (ids that also
+    match the filters) in one transaction. Returns a status per requested
+    id, or one entry per deleted employee for filter-only deletes.
+    """
+    query = select(Employee.id)
+    for condition in filters:
+        query = query.where(condition)
+
+    if ids is not None:
+        matched = []
+        for chunk in _chunks(list(dict.fromkeys(ids))):
+            matched += session.exec(query.where(Employee.id.in_(chunk))).all()
+    else:
+        matched = session.exec(query).all()
+
+    before = _load_snapshots(session, matched)
+    apply_deltas(session, summary_deltas(before.values(), []))
+    for chunk in _chunks(matched):
+        unindex_employees(session, chunk)
+        session.exec(delete(Employee).where(Employee.id.in_(chunk)))
+
+    session.commit()
+    invalidate_cube_cache()
+
+    deleted = set(matched)
+    if ids is None:
+        return [{"id": emp_id, "status": "deleted"} for emp_id in matched]
+    return [{"id": emp_id, "status": "deleted" if emp_id in deleted else "not_found"} for emp_id in ids]
@@ -1,14 +1,122 @@
+from sqlalchemy import event, inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import create_engine, SQLModel
 import os
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./hranalytics.db")
 
-# Create engine with echo for debugging
-engine = create_engine(
-    DATABASE_URL, 
-    echo=True,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+# Async drivers used by the async engine for each backend
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+# Dialect INSERT constructs that support ON CONFLICT DO UPDATE
+UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+# Engine and pool settings
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() in ("1", "true", "yes")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# SQLite pragmas applied to every new connection
+SQLITE_WAL = os.getenv("SQLITE_WAL", "true").lower() in ("1", "true", "yes")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negative = KiB
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+
+def upsert_insert(session, table):
+    """INSERT for `table` on the session's dialect, with on_conflict_do_update()"""
+    dialect = session.get_bind().dialect.name
+    if dialect not in UPSERT_INSERTS:
+        raise NotImplementedError(f"INSERT ... ON CONFLICT is not available on {dialect}")
+    return UPSERT_INSERTS[dialect](table)
+
+
+def sqlite_pragmas(in_memory: bool = False) -> list:
+    """PRAGMA statements run on each new SQLite connection"""
+    pragmas = [
+        f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}",
+        f"PRAGMA cache_size={SQLITE_CACHE_SIZE}",
+        f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+    ]
+    if not in_memory:
+        # WAL lets readers keep going while a writer commits
+        if SQLITE_WAL:
+            pragmas.insert(0, "PRAGMA journal_mode=WAL")
+        pragmas.append(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    return pragmas
+
+
+def _engine_options(url) -> dict:
+    """Pool and connect options from the DB_* settings"""
+    is_sqlite = url.get_backend_name() == "sqlite"
+    in_memory = is_sqlite and url.database in (None, "", ":memory:")
+
+    options = {"echo": DB_ECHO, "pool_pre_ping": DB_POOL_PRE_PING}
+    if not in_memory:
+        # In-memory SQLite uses a single-connection pool without these knobs
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    if is_sqlite:
+        options["connect_args"] = {"check_same_thread": False}
+    return options
+
+
+def _install_sqlite_pragmas(sync_engine, url) -> None:
+    """Run the SQLITE_* pragmas on every new connection of a SQLite engine"""
+    if url.get_backend_name() != "sqlite":
+        return
+    pragmas = sqlite_pragmas(url.database in (None, "", ":memory:"))
+
+    @event.listens_for(sync_engine, "connect")
+    def apply_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def make_engine(url: str = DATABASE_URL, **overrides):
+    """
+    Create an engine from the DB_* settings above; keyword arguments
+    override them (e.g. echo=True). SQLite connections get the SQLITE_*
+    pragmas on connect.
+    """
+    parsed = make_url(url)
+    engine = create_engine(url, **{**_engine_options(parsed), **overrides})
+    _install_sqlite_pragmas(engine, parsed)
+    return engine
+
+
+def async_url(url: str = DATABASE_URL) -> str:
+    """DATABASE_URL with its driver swapped for the async one (aiosqlite / asyncpg)"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.get_backend_name()}")
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+
+def make_async_engine(url: str = None, **overrides):
+    """Async counterpart of make_engine(); defaults to ASYNC_DATABASE_URL or async_url(DATABASE_URL)"""
+    url = url or os.getenv("ASYNC_DATABASE_URL") or async_url()
+    parsed = make_url(url)
+    engine = create_async_engine(url, **{**_engine_options(parsed), **overrides})
+    _install_sqlite_pragmas(engine.sync_engine, parsed)
+    return engine
+
+
+engine = make_engine()
+async_engine = make_async_engine()
 
 def create_db_and_tables():
     """Create all database tables"""
@@ -17,6 +125,47 @@ def create_db_and_tables():
     from app.models.employee import Employee
     from app.models.model import Model
     from app.models.prediction import Prediction
-    
+    from app.models.analytics_summary import AnalyticsSummary
+    from app.models.prediction_job import PredictionJob
+    from app.models.prediction_rollup import PredictionRollup
+
     # Create all tables
-    SQLModel.metadata.create_all(engine)
\ No newline at end of file
+    SQLModel.metadata.create_all(engine)
+    add_missing_columns()
+    create_missing_indexes()
+
+
+def add_missing_columns():
+    """
+    create_all() never alters existing tables, so add columns declared on a
+    model after its table was created. Only nullable columns can be added
+    this way; anything else needs a real migration.
+    """
+    inspector = inspect(engine)
+    quote = engine.dialect.identifier_preparer.quote
+    with engine.begin() as connection:
+        for table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                if not column.nullable:
+                    raise RuntimeError(
+                        f"Cannot add NOT NULL column {table.name}.{column.name} to an existing table"
+                    )
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(text(
+                    f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}"
+                ))
+
+
+def create_missing_indexes():
+    """
+    create_all() only builds indexes together with new tables, so add any
+    index declared on a model to databases created before it existed
+    """
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
@@ -0,0 +1,51 @@
+import statistics
+import time
+from typing import List
+
+from sqlmodel import Session
+
+
+def compile_sql(session: Session, statement) -> str:
+    """Render a statement as SQL for the session's dialect, binds inlined"""
+    dialect = session.get_bind().dialect
+    return str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+def query_plan(session: Session, sql: str) -> list:
+    """Ask the database how it runs `sql` (SQLite and PostgreSQL)"""
+    dialect = session.get_bind().dialect.name
+    connection = session.connection()
+    if dialect == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all()
+        return [row[-1] for row in rows]
+    if dialect == "postgresql":
+        rows = connection.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}").all()
+        return rows[0][0]
+    return []
+
+
+def profile_statements(session: Session, statements: List, runs: int = 5) -> dict:
+    """
+    Time a set of statements that together serve one endpoint and return
+    their SQL, query plans and per-load DB time in milliseconds.
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for statement in statements:
+            session.exec(statement).all()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    queries = []
+    for statement in statements:
+        sql = compile_sql(session, statement)
+        queries.append({"sql": sql, "plan": query_plan(session, sql)})
+
+    return {
+        "dialect": session.get_bind().dialect.name,
+        "roundTrips": len(statements),
+        "runs": runs,
+        "minMs": round(min(timings), 3),
+        "medianMs": round(statistics.median(timings), 3),
+        "queries": queries,
+    }
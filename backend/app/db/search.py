@@ -0,0 +1,175 @@
+"""
+Employee search index.
+
+SQLite: an FTS5 table (employee_fts, rowid = employee.id) over job role,
+department, education field and employee number, ranked with bm25().
+The employee CRUD handlers keep it in sync through index_employees() and
+unindex_employees().
+
+PostgreSQL: GIN indexes over the same fields as a 'simple' tsvector
+(ranked with ts_rank) and as trigrams (for substring matches). Both are
+expression indexes, so PostgreSQL maintains them itself.
+
+Other databases fall back to substring matching.
+"""
+import logging
+import re
+from typing import Dict, Iterable, List
+
+from sqlalchemy import table, column
+from sqlmodel import Session, select, func, or_, text, bindparam, literal_column
+from sqlalchemy.exc import OperationalError
+
+from app.models.employee import Employee
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FIELDS = ("job_role", "department", "education_field", "employee_number")
+
+FTS_TABLE = "employee_fts"
+
+# Searchable document for PostgreSQL; the query must repeat this exact
+# expression for the planner to use the indexes built on it
+PG_DOCUMENT_SQL = (
+    "(coalesce(employee.job_role, '') || ' ' || coalesce(employee.department, '') || ' ' || "
+    "coalesce(employee.education_field, '') || ' ' || coalesce(employee.employee_number::text, ''))"
+)
+
+# bind URL -> whether the SQLite FTS5 table exists
+_fts_ready: Dict[str, bool] = {}
+
+
+def _dialect(session: Session) -> str:
+    return session.get_bind().dialect.name
+
+
+def _has_fts(session: Session) -> bool:
+    bind = session.get_bind()
+    key = str(bind.url)
+    if key not in _fts_ready:
+        exists = session.exec(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            params={"name": FTS_TABLE},
+        ).first()
+        _fts_ready[key] = exists is not None
+    return _fts_ready[key]
+
+
+def search_terms(search: str) -> List[str]:
+    """Split user input into word tokens usable in FTS5 and tsquery syntax"""
+    return re.findall(r"\w+", search.lower())
+
+
+def ensure_search_index(session: Session) -> None:
+    """Create the search index for the current database and fill it if new"""
+    dialect = _dialect(session)
+    if dialect == "sqlite":
+        try:
+            session.exec(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+                f"USING fts5({', '.join(SEARCH_FIELDS)}, tokenize = 'unicode61')"
+            ))
+        except OperationalError as e:
+            logger.warning(f"⚠ SQLite FTS5 unavailable, search falls back to LIKE: {e}")
+            _fts_ready[str(session.get_bind().url)] = False
+            return
+        _fts_ready[str(session.get_bind().url)] = True
+        indexed = session.exec(text(f"SELECT count(*) FROM {FTS_TABLE}")).one()[0]
+        employees = session.exec(select(func.count(Employee.id))).one()
+        if not indexed and employees:
+            rebuild_search_index(session)
+        session.commit()
+    elif dialect == "postgresql":
+        session.exec(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        session.exec(text(
+            "CREATE INDEX IF NOT EXISTS ix_employee_search_tsv ON employee "
+            f"USING gin (to_tsvector('simple', {PG_DOCUMENT_SQL}))"
+        ))
+        session.exec(text(
+            "CREATE INDEX IF NOT EXISTS ix_employee_search_trgm ON employee "
+            f"USING gin ({PG_DOCUMENT_SQL} gin_trgm_ops)"
+        ))
+        session.commit()
+
+
+def index_employees(session: Session, employees: Iterable[Employee]) -> None:
+    """(Re)index employees in the caller's transaction; they must have ids"""
+    if _dialect(session) != "sqlite" or not _has_fts(session):
+        return
+    rows = [
+        {"id": emp.id, **{field: _as_text(getattr(emp, field)) for field in SEARCH_FIELDS}}
+        for emp in employees
+    ]
+    if not rows:
+        return
+    unindex_employees(session, [row["id"] for row in rows])
+    session.exec(
+        text(
+            f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(SEARCH_FIELDS)}) "
+            f"VALUES (:id, {', '.join(':' + field for field in SEARCH_FIELDS)})"
+        ),
+        params=rows,
+    )
+
+
+def unindex_employees(session: Session, ids: Iterable[int]) -> None:
+    """Remove employees from the search index in the caller's transaction"""
+    ids = list(ids)
+    if not ids or _dialect(session) != "sqlite" or not _has_fts(session):
+        return
+    session.exec(
+        text(f"DELETE FROM {FTS_TABLE} WHERE rowid IN :ids").bindparams(
+            bindparam("ids", expanding=True)
+        ),
+        params={"ids": ids},
+    )
+
+
+def rebuild_search_index(session: Session) -> None:
+    """Refill the SQLite search index from the employee table"""
+    if _dialect(session) != "sqlite" or not _has_fts(session):
+        return
+    session.exec(text(f"DELETE FROM {FTS_TABLE}"))
+    session.exec(text(
+        f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(SEARCH_FIELDS)}) "
+        f"SELECT id, {', '.join(f'CAST({field} AS TEXT)' for field in SEARCH_FIELDS)} FROM employee"
+    ))
+    session.commit()
+
+
+def apply_search(session: Session, query, search: str):
+    """
+    Restrict an Employee select to rows matching `search` and order them by
+    relevance. Every word is a prefix match, and all words must match.
+    """
+    terms = search_terms(search)
+    if not terms:
+        return query
+
+    dialect = _dialect(session)
+    if dialect == "sqlite" and _has_fts(session):
+        fts = literal_column(FTS_TABLE)
+        fts_rows = table(FTS_TABLE, column("rowid"))
+        match = " ".join(f'"{term}"*' for term in terms)
+        return (
+            query.join(fts_rows, fts_rows.c.rowid == Employee.id)
+            .where(fts.op("MATCH")(match))
+            .order_by(func.bm25(fts), Employee.id)
+        )
+
+    if dialect == "postgresql":
+        document = literal_column(PG_DOCUMENT_SQL)
+        vector = func.to_tsvector(literal_column("'simple'"), document)
+        tsquery = func.to_tsquery(literal_column("'simple'"), " & ".join(f"{term}:*" for term in terms))
+        return (
+            query.where(or_(vector.op("@@")(tsquery), document.ilike(f"%{search}%")))
+            .order_by(func.ts_rank(vector, tsquery).desc(), Employee.id)
+        )
+
+    return query.where(or_(*[
+        getattr(Employee, field).contains(search) for field in SEARCH_FIELDS[:3]
+    ])).order_by(Employee.id)
+
+
+def _as_text(value):
+    return None if value is None else str(value)
@@ -1,6 +1,12 @@
 from sqlmodel import Session
-from app.db.engine import engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.engine import engine, async_engine
 
 def get_session():
     with Session(engine) as session:
-        yield session
\ No newline at end of file
+        yield session
+
+async def get_async_session():
+    # Objects stay loaded after commit so handlers can return them
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
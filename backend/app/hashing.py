@@ -0,0 +1,98 @@
+"""
+Password hashing off the request path.
+
+bcrypt is deliberately slow (hundreds of milliseconds of CPU at the
+default cost), so the auth handlers run it on a dedicated, small thread
+pool instead of the shared threadpool that serves every sync endpoint.
+At most BCRYPT_WORKERS hashes run at once and at most BCRYPT_MAX_QUEUE
+more wait; beyond that PasswordHasher raises HasherSaturated and the
+handlers answer 429, so a login burst cannot starve other traffic.
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+# bcrypt cost factor for new hashes; existing hashes keep the cost they were made with
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", "2"))
+BCRYPT_MAX_QUEUE = int(os.getenv("BCRYPT_MAX_QUEUE", "32"))
+
+
+class HasherSaturated(Exception):
+    """Raised when BCRYPT_WORKERS are busy and BCRYPT_MAX_QUEUE requests already wait"""
+
+
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+
+
+def check_password(password: str, hashed: str) -> bool:
+    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+
+class PasswordHasher:
+    """Bounded bcrypt executor with queue-depth counters"""
+
+    def __init__(self, workers: int = BCRYPT_WORKERS, max_queue: int = BCRYPT_MAX_QUEUE, rounds: int = BCRYPT_ROUNDS):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.max_queue = max_queue
+        self.rounds = rounds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.busy_seconds = 0.0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password, self.rounds)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(check_password, password, hashed)
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self.in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HasherSaturated()
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self._timed, fn, args)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _timed(self, fn, args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.completed += 1
+                self.busy_seconds += elapsed
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "maxQueue": self.max_queue,
+                "rounds": self.rounds,
+                "inFlight": self.in_flight,
+                "queued": max(self.in_flight - self.workers, 0),
+                "peakInFlight": self.peak_in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "averageMs": round(self.busy_seconds / self.completed * 1000, 2) if self.completed else 0,
+            }
+
+
+password_hasher = PasswordHasher()
@@ -1,9 +1,14 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlmodel import SQLModel
+from sqlmodel import SQLModel, Session
 import logging
 
-from app.db.engine import engine
+from app.db.engine import engine, async_engine, add_missing_columns, create_missing_indexes
+from app.analytics.summary import ensure_summary
+from app.db.search import ensure_search_index
+from app.analytics.prediction_rollup import ensure_rollups
 from app.routes import auth, employees, analytics, predict
 
 # Configure logging
@@ -19,18 +24,50 @@ def create_db_and_tables():
         from app.models.employee import Employee
         from app.models.model import Model
         from app.models.prediction import Prediction
+        from app.models.analytics_summary import AnalyticsSummary
+        from app.models.prediction_job import PredictionJob
+        from app.models.prediction_rollup import PredictionRollup
         
         logger.info("Creating database tables...")
         SQLModel.metadata.create_all(engine)
+        add_missing_columns()
+        create_missing_indexes()
         logger.info("✓ Database tables created successfully")
     except Exception as e:
         logger.error(f"✗ Error creating database tables: {e}")
         raise
 
+# Create tables, fill derived tables and start background workers on startup
+def on_startup():
+    create_db_and_tables()
+    with Session(engine) as session:
+        ensure_summary(session)
+        ensure_search_index(session)
+        ensure_rollups(session)
+    # Loads (and warms up) the model unless MODEL_PRELOAD is off
+    predict.models.start()
+    predict.job_runner.start()
+    if predict.prediction_writer is not None:
+        predict.prediction_writer.start()
+
+async def on_shutdown():
+    predict.job_runner.stop()
+    if predict.prediction_writer is not None:
+        predict.prediction_writer.stop()
+    await async_engine.dispose()
+    predict.models.stop()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    on_startup()
+    yield
+    await on_shutdown()
+
 app = FastAPI(
     title="HR Analytics Attrition API",
     version="1.0",
-    description="API for HR Analytics and Employee Attrition Prediction"
+    description="API for HR Analytics and Employee Attrition Prediction",
+    lifespan=lifespan
 )
 
 # CORS middleware - configure for your frontend
@@ -45,13 +82,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Model-Version"],
 )
 
-# Create tables on startup
-@app.on_event("startup")
-def on_startup():
-    create_db_and_tables()
-
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(employees.router, prefix="/api/employees", tags=["Employees"])
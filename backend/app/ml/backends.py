@@ -0,0 +1,191 @@
+"""
+Inference backends.
+
+Every backend takes the encoded float matrix from app.ml.features and
+returns positive-class probabilities as a 1-D array. PREDICT_BACKEND
+selects one:
+
+- sklearn:  the pickled XGBClassifier's predict_proba (the original path)
+- booster:  the raw XGBoost Booster scored with inplace_predict, loaded
+            from the model.ubj that train_model saves next to model.pkl
+            (or taken from the pickle when that file is missing or older)
+- treelite: the Booster compiled to a shared library with Treelite/TL2cgen
+            (needs `treelite`, `tl2cgen` and a C compiler)
+- onnx:     the Booster converted to ONNX and run by onnxruntime
+            (needs `onnxmltools` and `onnxruntime`)
+
+Compiled artifacts are cached in PREDICT_BACKEND_CACHE_DIR, keyed by the
+model file's content hash, so workers after the first skip the compile.
+Treelite and ONNX score in float32; their probabilities can differ from
+XGBoost's in the seventh decimal place.
+"""
+import logging
+import os
+from typing import Optional
+
+import joblib
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PREDICT_BACKEND = os.getenv("PREDICT_BACKEND", "booster")
+PREDICT_BACKEND_CACHE_DIR = os.getenv("PREDICT_BACKEND_CACHE_DIR", "model/compiled")
+
+BOOSTER_SUFFIXES = (".ubj", ".json")
+
+
+class InferenceBackend:
+    """Scores an encoded matrix; subclasses implement predict_proba"""
+
+    name = "base"
+
+    def predict_proba(self, matrix: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def info(self) -> dict:
+        return {"backend": self.name}
+
+
+class SklearnBackend(InferenceBackend):
+    name = "sklearn"
+
+    def __init__(self, model, threads: Optional[int] = None):
+        self.model = model
+        if threads and hasattr(model, "set_params"):
+            model.set_params(n_jobs=threads)
+
+    def predict_proba(self, matrix: np.ndarray) -> np.ndarray:
+        return self.model.predict_proba(matrix)[:, 1]
+
+    def info(self) -> dict:
+        return {"backend": self.name, "modelType": type(self.model).__name__}
+
+
+class BoosterBackend(InferenceBackend):
+    name = "booster"
+
+    def __init__(self, booster, threads: Optional[int] = None):
+        self.booster = booster
+        if threads:
+            booster.set_param({"nthread": threads})
+
+    def predict_proba(self, matrix: np.ndarray) -> np.ndarray:
+        # binary:logistic returns the positive-class probability directly
+        return self.booster.inplace_predict(matrix)
+
+    def info(self) -> dict:
+        return {"backend": self.name, "modelType": "Booster", "trees": self.booster.num_boosted_rounds()}
+
+
+class TreeliteBackend(InferenceBackend):
+    name = "treelite"
+
+    def __init__(self, library_path: str, threads: Optional[int] = None):
+        import tl2cgen
+
+        self._tl2cgen = tl2cgen
+        self.library_path = library_path
+        self.predictor = tl2cgen.Predictor(library_path, nthread=threads or os.cpu_count() or 1)
+
+    def predict_proba(self, matrix: np.ndarray) -> np.ndarray:
+        data = self._tl2cgen.DMatrix(np.ascontiguousarray(matrix, dtype=np.float32), dtype="float32")
+        return self.predictor.predict(data).reshape(-1)
+
+    def info(self) -> dict:
+        return {"backend": self.name, "modelType": "Treelite", "library": self.library_path}
+
+
+class OnnxBackend(InferenceBackend):
+    name = "onnx"
+
+    def __init__(self, onnx_path: str, threads: Optional[int] = None):
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.onnx_path = onnx_path
+        self.session = onnxruntime.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+        # Outputs are (label, probabilities)
+        self.output_name = self.session.get_outputs()[1].name
+
+    def predict_proba(self, matrix: np.ndarray) -> np.ndarray:
+        inputs = {self.input_name: np.ascontiguousarray(matrix, dtype=np.float32)}
+        return self.session.run([self.output_name], inputs)[0][:, 1]
+
+    def info(self) -> dict:
+        return {"backend": self.name, "modelType": "ONNX", "file": self.onnx_path}
+
+
+def booster_path(model_path: str) -> str:
+    """Where train_model saves the raw Booster for a pickled model"""
+    return os.path.splitext(model_path)[0] + ".ubj"
+
+
+def load_booster(model_path: str):
+    """
+    The XGBoost Booster for model_path: read directly from a .ubj/.json
+    file, or from the .ubj saved next to the pickle when it is at least as
+    new, otherwise unwrapped from the pickled XGBClassifier
+    """
+    import xgboost
+
+    if model_path.endswith(BOOSTER_SUFFIXES):
+        return xgboost.Booster(model_file=model_path)
+    native = booster_path(model_path)
+    if os.path.exists(native) and os.path.getmtime(native) >= os.path.getmtime(model_path):
+        return xgboost.Booster(model_file=native)
+    logger.info("No up-to-date %s, taking the Booster from %s", native, model_path)
+    return joblib.load(model_path).get_booster()
+
+
+def _artifact_path(model_path: str, suffix: str) -> str:
+    from app.ml.cache import file_version
+
+    os.makedirs(PREDICT_BACKEND_CACHE_DIR, exist_ok=True)
+    return os.path.join(PREDICT_BACKEND_CACHE_DIR, f"model-{file_version(model_path)}{suffix}")
+
+
+def compile_treelite(model_path: str) -> str:
+    """Compile the Booster to a shared library (cached) and return its path"""
+    import treelite
+    import tl2cgen
+
+    library = _artifact_path(model_path, ".so")
+    if not os.path.exists(library):
+        logger.info("Compiling %s with Treelite into %s", model_path, library)
+        tree_model = treelite.frontend.from_xgboost(load_booster(model_path))
+        tl2cgen.export_lib(tree_model, toolchain="gcc", libpath=library, params={"parallel_comp": os.cpu_count() or 1})
+    return library
+
+
+def export_onnx(model_path: str) -> str:
+    """Convert the Booster to ONNX (cached) and return the file path"""
+    import onnxmltools
+    from onnxmltools.convert.common.data_types import FloatTensorType
+
+    onnx_path = _artifact_path(model_path, ".onnx")
+    if not os.path.exists(onnx_path):
+        logger.info("Converting %s to ONNX in %s", model_path, onnx_path)
+        booster = load_booster(model_path).copy()
+        features = booster.num_features()
+        # The converter only understands the positional f0, f1, ... names
+        booster.feature_names = None
+        onnx_model = onnxmltools.convert_xgboost(booster, initial_types=[("input", FloatTensorType([None, features]))])
+        with open(onnx_path, "wb") as f:
+            f.write(onnx_model.SerializeToString())
+    return onnx_path
+
+
+def load_backend(name: str, model_path: str, threads: Optional[int] = None) -> InferenceBackend:
+    """Load model_path behind the named backend"""
+    if name == "sklearn":
+        return SklearnBackend(joblib.load(model_path), threads)
+    if name == "booster":
+        return BoosterBackend(load_booster(model_path), threads)
+    if name == "treelite":
+        return TreeliteBackend(compile_treelite(model_path), threads)
+    if name == "onnx":
+        return OnnxBackend(export_onnx(model_path), threads)
+    raise ValueError(f"Unknown inference backend '{name}'. Choose from: sklearn, booster, treelite, onnx")
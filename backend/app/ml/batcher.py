@@ -0,0 +1,119 @@
+import asyncio
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import numpy as np
+
+# Opt-in: collect concurrent /single requests and score them together
+MICROBATCH_ENABLED = os.getenv("PREDICT_MICROBATCH", "false").lower() in ("1", "true", "yes")
+MICROBATCH_MAX_SIZE = int(os.getenv("PREDICT_MICROBATCH_MAX_SIZE", "32"))
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("PREDICT_MICROBATCH_MAX_WAIT_MS", "2"))
+
+
+class MicroBatcher:
+    """
+    Asyncio micro-batcher in front of the model.
+
+    Requests call `await submit(row)`. A collector task waits for the first
+    row, keeps collecting for up to `max_wait_ms` or until `max_batch_size`
+    rows are queued, scores the stacked matrix with one `score_fn` call on
+    a worker thread and resolves each request's future with its own
+    (prediction, probability, risk level).
+
+    Pass the histogram of a batcher being replaced (on model reload) to keep
+    counting into it; the request and batch totals derive from it.
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable,
+        max_batch_size: int = MICROBATCH_MAX_SIZE,
+        max_wait_ms: float = MICROBATCH_MAX_WAIT_MS,
+        histogram: Optional[Counter] = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.histogram = histogram if histogram is not None else Counter()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="microbatch")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _ensure_running(self):
+        # The queue and collector task belong to the loop that serves requests
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._collect())
+
+    async def submit(self, row: np.ndarray):
+        """Queue one encoded (1, n_features) row and wait for its result"""
+        self._ensure_running()
+        future = self._loop.create_future()
+        self._queue.put_nowait((row, future))
+        return await future
+
+    async def _collect(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._score(batch)
+
+    async def _score(self, batch):
+        self.histogram[len(batch)] += 1
+
+        matrix = np.vstack([row for row, _ in batch])
+        try:
+            predictions, probabilities, risk = await self._loop.run_in_executor(
+                self._executor, self.score_fn, matrix
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for i, (_, future) in enumerate(batch):
+            # A request may have been cancelled while its batch was scoring
+            if not future.done():
+                future.set_result((int(predictions[i]), float(probabilities[i]), str(risk[i])))
+
+    @property
+    def requests(self) -> int:
+        return sum(size * count for size, count in self.histogram.items())
+
+    @property
+    def batches(self) -> int:
+        return sum(self.histogram.values())
+
+    def close(self) -> None:
+        """Stop the collector task and the scoring thread; callable from any thread"""
+        if self._task is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> dict:
+        requests, batches = self.requests, self.batches
+        return {
+            "enabled": True,
+            "maxBatchSize": self.max_batch_size,
+            "maxWaitMs": self.max_wait * 1000,
+            "requests": requests,
+            "batches": batches,
+            "meanBatchSize": round(requests / batches, 2) if batches else 0,
+            "histogram": {str(size): count for size, count in sorted(self.histogram.items())},
+        }
@@ -0,0 +1,84 @@
+import hashlib
+import os
+from typing import Optional
+
+import numpy as np
+
+from app.cache import LRUTTLCache
+
+PREDICT_CACHE_SIZE = int(os.getenv("PREDICT_CACHE_SIZE", "10000"))
+PREDICT_CACHE_TTL = float(os.getenv("PREDICT_CACHE_TTL", "300"))
+
+
+def file_signature(path: str) -> Optional[tuple]:
+    """(mtime, size) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def artifact_hash(path: str) -> str:
+    """Full sha256 of a model artifact, as recorded in the model registry"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_version(path: str) -> str:
+    """Short content hash of a model artifact, used as its version"""
+    return artifact_hash(path)[:12]
+
+
+class PredictionCache:
+    """
+    Cache of single-prediction results keyed by a hash of the encoded
+    feature row plus the model version.
+
+    Watches the model file: when its mtime or size changes every entry is
+    dropped, so results from a replaced model are never served.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        model_version: str,
+        max_size: int = PREDICT_CACHE_SIZE,
+        ttl_seconds: float = PREDICT_CACHE_TTL,
+    ):
+        self.model_path = model_path
+        self.model_version = model_version
+        self.invalidations = 0
+        self._signature = file_signature(model_path)
+        self._cache = LRUTTLCache(max_size, ttl_seconds)
+
+    def key(self, row: np.ndarray) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.model_version.encode())
+        digest.update(np.ascontiguousarray(row, dtype=np.float64).tobytes())
+        return digest.digest()
+
+    def _check_model(self):
+        signature = file_signature(self.model_path)
+        if signature != self._signature:
+            self._signature = signature
+            self._cache.clear()
+            self.invalidations += 1
+
+    def get(self, key: bytes):
+        self._check_model()
+        return self._cache.get(key)
+
+    def set(self, key: bytes, result) -> None:
+        self._cache.set(key, result)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": True,
+            "modelVersion": self.model_version,
+            "invalidations": self.invalidations,
+            **self._cache.stats(),
+        }
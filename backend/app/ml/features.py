@@ -0,0 +1,221 @@
+import threading
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    # pandas is imported when a frame is first built, keeping it out of worker startup
+    import pandas as pd
+
+# Hard-coded label encodings (matching your training data)
+LABEL_ENCODINGS = {
+    "BusinessTravel": {"Non-Travel": 0, "Travel_Rarely": 1, "Travel_Frequently": 2},
+    "Department": {
+        "Sales": 0,
+        "Research & Development": 1,
+        "Human Resources": 2,
+        "IT": 3,
+        "Finance": 4,
+        "Marketing": 5,
+        "Operations": 6,
+    },
+    "EducationField": {
+        "Life Sciences": 0,
+        "Medical": 1,
+        "Marketing": 2,
+        "Technical Degree": 3,
+        "Other": 4,
+        "Human Resources": 5,
+    },
+    "Gender": {"Female": 0, "Male": 1},
+    "JobRole": {
+        "Sales Executive": 0,
+        "Research Scientist": 1,
+        "Laboratory Technician": 2,
+        "Manufacturing Director": 3,
+        "Healthcare Representative": 4,
+        "Manager": 5,
+        "Sales Representative": 6,
+        "Research Director": 7,
+        "Human Resources": 8,
+        "Senior Engineer": 9,
+        "Software Engineer": 10,
+        "Marketing Manager": 11,
+    },
+    "MaritalStatus": {"Single": 0, "Married": 1, "Divorced": 2},
+    "OverTime": {"No": 0, "Yes": 1},
+}
+
+# Column name mapping: snake_case (API) -> PascalCase (Model)
+COLUMN_MAPPING = {
+    'age': 'Age',
+    'business_travel': 'BusinessTravel',
+    'daily_rate': 'DailyRate',
+    'department': 'Department',
+    'distance_from_home': 'DistanceFromHome',
+    'education': 'Education',
+    'education_field': 'EducationField',
+    'environment_satisfaction': 'EnvironmentSatisfaction',
+    'gender': 'Gender',
+    'hourly_rate': 'HourlyRate',
+    'job_involvement': 'JobInvolvement',
+    'job_level': 'JobLevel',
+    'job_role': 'JobRole',
+    'job_satisfaction': 'JobSatisfaction',
+    'marital_status': 'MaritalStatus',
+    'monthly_income': 'MonthlyIncome',
+    'monthly_rate': 'MonthlyRate',
+    'num_companies_worked': 'NumCompaniesWorked',
+    'over_time': 'OverTime',
+    'percent_salary_hike': 'PercentSalaryHike',
+    'performance_rating': 'PerformanceRating',
+    'relationship_satisfaction': 'RelationshipSatisfaction',
+    'stock_option_level': 'StockOptionLevel',
+    'total_working_years': 'TotalWorkingYears',
+    'training_times_last_year': 'TrainingTimesLastYear',
+    'work_life_balance': 'WorkLifeBalance',
+    'years_at_company': 'YearsAtCompany',
+    'years_in_current_role': 'YearsInCurrentRole',
+    'years_since_last_promotion': 'YearsSinceLastPromotion',
+    'years_with_curr_manager': 'YearsWithCurrManager',
+}
+
+# Expected features in the model (30 features)
+EXPECTED_FEATURES = [
+    'Age', 'BusinessTravel', 'DailyRate', 'Department', 'DistanceFromHome',
+    'Education', 'EducationField', 'EnvironmentSatisfaction', 'Gender',
+    'HourlyRate', 'JobInvolvement', 'JobLevel', 'JobRole', 'JobSatisfaction',
+    'MaritalStatus', 'MonthlyIncome', 'MonthlyRate', 'NumCompaniesWorked',
+    'OverTime', 'PercentSalaryHike', 'PerformanceRating', 'RelationshipSatisfaction',
+    'StockOptionLevel', 'TotalWorkingYears', 'TrainingTimesLastYear',
+    'WorkLifeBalance', 'YearsAtCompany', 'YearsInCurrentRole',
+    'YearsSinceLastPromotion', 'YearsWithCurrManager'
+]
+
+
+def prepare_features_for_model(data_dict: dict) -> "pd.DataFrame":
+    """
+    Prepare features for model prediction:
+    1. Convert snake_case to PascalCase
+    2. Encode categorical features
+    3. Select only the features the model expects
+    4. Ensure correct order
+    """
+    import pandas as pd
+
+    # Create DataFrame from input
+    df = pd.DataFrame([data_dict])
+    
+    # Rename columns from snake_case to PascalCase
+    df = df.rename(columns=COLUMN_MAPPING)
+    
+    # Encode categorical features using PascalCase names
+    for col, mapping in LABEL_ENCODINGS.items():
+        if col in df.columns:
+            df[col] = df[col].map(mapping).fillna(-1).astype(int)
+    
+    # Select only the features expected by the model (removes extra columns)
+    # Keep only columns that exist in both df and EXPECTED_FEATURES
+    available_features = [col for col in EXPECTED_FEATURES if col in df.columns]
+    df_model = df[available_features]
+    
+    # Ensure all expected features are present (add missing with 0)
+    for feature in EXPECTED_FEATURES:
+        if feature not in df_model.columns:
+            df_model[feature] = 0
+    
+    # Reorder columns to match model expectations
+    df_model = df_model[EXPECTED_FEATURES]
+    
+    return df_model
+
+
+def encode_frame(df: "pd.DataFrame") -> np.ndarray:
+    """
+    Columnar version of prepare_features_for_model for whole uploads.
+
+    Encodes every row at once and returns a float matrix with one column
+    per entry in EXPECTED_FEATURES. Accepts snake_case or PascalCase
+    headers; unknown categories become -1, missing features become 0 and
+    empty numeric cells stay NaN (XGBoost treats them as missing).
+    """
+    import pandas as pd
+
+    df = df.rename(columns=COLUMN_MAPPING)
+    # Keep the first occurrence if a file carries both spellings of a column
+    df = df.loc[:, ~df.columns.duplicated()]
+
+    matrix = np.zeros((len(df), len(EXPECTED_FEATURES)), dtype=np.float64)
+    for i, feature in enumerate(EXPECTED_FEATURES):
+        if feature not in df.columns:
+            continue
+        column = df[feature]
+        if feature in LABEL_ENCODINGS:
+            matrix[:, i] = column.map(LABEL_ENCODINGS[feature]).fillna(-1).to_numpy()
+        else:
+            matrix[:, i] = pd.to_numeric(column, errors="coerce").to_numpy()
+    return matrix
+
+
+class FeatureEncoder:
+    """
+    Encoder for single predictions, compiled once from EXPECTED_FEATURES,
+    COLUMN_MAPPING and LABEL_ENCODINGS.
+
+    encode() reads snake_case fields off an EmployeePredictionInput (or a
+    dict) and writes them straight into a (1, n_features) float row in model
+    order, with the same rules as prepare_features_for_model: unknown
+    categories are -1 and absent features are 0.
+    """
+
+    def __init__(
+        self,
+        features: list = EXPECTED_FEATURES,
+        column_mapping: dict = COLUMN_MAPPING,
+        label_encodings: dict = LABEL_ENCODINGS,
+    ):
+        pascal_to_snake = {pascal: snake for snake, pascal in column_mapping.items()}
+        self.features = list(features)
+        self.width = len(self.features)
+        self._numeric = []
+        self._categorical = []
+        for i, feature in enumerate(self.features):
+            field = pascal_to_snake.get(feature, feature)
+            if feature in label_encodings:
+                self._categorical.append((i, field, label_encodings[feature]))
+            else:
+                self._numeric.append((i, field))
+        self._local = threading.local()
+
+    def new_row(self) -> np.ndarray:
+        """Allocate a zeroed (1, n_features) row"""
+        return np.zeros((1, self.width), dtype=np.float64)
+
+    def encode(self, data, out: np.ndarray = None) -> np.ndarray:
+        """
+        Encode one employee into `out` (a (1, n_features) row) and return it.
+
+        Without `out` a per-thread preallocated row is reused, so copy the
+        result if it has to outlive the next encode() on the same thread.
+        """
+        if out is None:
+            out = getattr(self._local, "row", None)
+            if out is None:
+                out = self._local.row = self.new_row()
+        row = out.reshape(-1)
+
+        if isinstance(data, dict):
+            get = data.get
+        else:
+            get = lambda field, default=None: getattr(data, field, default)
+
+        for i, field in self._numeric:
+            value = get(field, 0)
+            row[i] = np.nan if value is None else value
+        for i, field, mapping in self._categorical:
+            row[i] = mapping.get(get(field), -1)
+        return out
+
+
+# Shared encoder used by the prediction routes
+feature_encoder = FeatureEncoder()
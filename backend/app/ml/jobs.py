@@ -0,0 +1,236 @@
+"""
+Background batch-prediction jobs.
+
+Uploads are saved under PREDICT_JOBS_DIR and recorded as PredictionJob
+rows; a JobRunner thread claims queued jobs and scores them
+PREDICT_JOB_CHUNK_ROWS rows at a time. After each chunk the output file is
+flushed and the job row records how many rows and output bytes are
+finished, so a job interrupted by a restart is picked up again, its output
+truncated back to the last finished chunk and scoring resumed from there.
+
+Jobs are claimed with a conditional UPDATE, so several web processes can
+run a JobRunner against the same database. A running job whose heartbeat
+is older than PREDICT_JOB_STALE_SECONDS is treated as abandoned.
+"""
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, BinaryIO, Callable, Optional
+
+from sqlmodel import Session, select, update, or_, and_
+
+from app.db.engine import engine
+from app.models.prediction_job import PredictionJob
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PREDICT_JOBS_DIR = os.getenv("PREDICT_JOBS_DIR", "jobs")
+PREDICT_JOB_CHUNK_ROWS = int(os.getenv("PREDICT_JOB_CHUNK_ROWS", "5000"))
+PREDICT_JOB_POLL_SECONDS = float(os.getenv("PREDICT_JOB_POLL_SECONDS", "5"))
+PREDICT_JOB_STALE_SECONDS = float(os.getenv("PREDICT_JOB_STALE_SECONDS", "60"))
+
+
+def create_job(session: Session, source: BinaryIO, filename: str, output_format: str) -> PredictionJob:
+    """Save an upload to the jobs folder and queue it"""
+    os.makedirs(PREDICT_JOBS_DIR, exist_ok=True)
+    job_id = uuid.uuid4().hex
+    input_path = os.path.join(PREDICT_JOBS_DIR, f"{job_id}.input.csv")
+    with open(input_path, "wb") as f:
+        while True:
+            block = source.read(1024 * 1024)
+            if not block:
+                break
+            f.write(block)
+
+    job = PredictionJob(
+        id=job_id,
+        filename=filename,
+        output_format=output_format,
+        input_path=input_path,
+        output_path=os.path.join(PREDICT_JOBS_DIR, f"{job_id}.{output_format}"),
+    )
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    return job
+
+
+def count_rows(path: str) -> int:
+    """Data rows in a CSV file (lines after the header)"""
+    lines, last = 0, b"\n"
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(1024 * 1024)
+            if not block:
+                break
+            lines += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        lines += 1  # no trailing newline
+    return max(lines - 1, 0)
+
+
+class JobRunner:
+    """Worker thread that claims PredictionJob rows and scores them chunk by chunk"""
+
+    def __init__(self, score_fn: Callable[["pd.DataFrame"], "pd.DataFrame"], chunk_rows: int = PREDICT_JOB_CHUNK_ROWS):
+        self.score_fn = score_fn
+        self.chunk_rows = chunk_rows
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="prediction-jobs", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        """Stop after the current chunk; an unfinished job resumes on the next start"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def notify(self) -> None:
+        """Wake the worker after a job was queued"""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                job_id = self._claim()
+                if job_id is not None:
+                    self._process(job_id)
+                    continue
+            except Exception:
+                logger.exception("Prediction job worker error")
+            self._wake.wait(PREDICT_JOB_POLL_SECONDS)
+            self._wake.clear()
+
+    def _claim(self) -> Optional[str]:
+        """Take the oldest queued or abandoned job, or return None"""
+        stale = datetime.utcnow() - timedelta(seconds=PREDICT_JOB_STALE_SECONDS)
+        claimable = or_(
+            PredictionJob.status == "queued",
+            and_(PredictionJob.status == "running", or_(
+                PredictionJob.claimed_by == self.worker_id,
+                PredictionJob.heartbeat_at < stale,
+                PredictionJob.heartbeat_at.is_(None),
+            )),
+        )
+        with Session(engine) as session:
+            candidates = session.exec(
+                select(PredictionJob.id).where(claimable).order_by(PredictionJob.created_at).limit(5)
+            ).all()
+            for job_id in candidates:
+                now = datetime.utcnow()
+                result = session.exec(
+                    update(PredictionJob)
+                    .where(PredictionJob.id == job_id, claimable)
+                    .values(status="running", claimed_by=self.worker_id, heartbeat_at=now)
+                )
+                session.commit()
+                if result.rowcount == 1:
+                    return job_id
+        return None
+
+    def _process(self, job_id: str) -> None:
+        with Session(engine) as session:
+            job = session.get(PredictionJob, job_id)
+            try:
+                if job.started_at is None:
+                    job.started_at = datetime.utcnow()
+                if job.total_rows is None:
+                    job.total_rows = count_rows(job.input_path)
+                session.add(job)
+                session.commit()
+                if job.processed_rows:
+                    logger.info("Resuming prediction job %s at row %d", job.id, job.processed_rows)
+
+                if self._score_chunks(session, job):
+                    job.status = "completed"
+                    job.total_rows = job.processed_rows
+                    job.finished_at = datetime.utcnow()
+                    session.add(job)
+                    session.commit()
+                    os.remove(job.input_path)
+                    logger.info("Prediction job %s completed: %d rows", job.id, job.processed_rows)
+            except Exception as e:
+                logger.exception("Prediction job %s failed", job_id)
+                session.rollback()
+                job = session.get(PredictionJob, job_id)
+                job.status = "failed"
+                job.error = str(e)
+                job.finished_at = datetime.utcnow()
+                session.add(job)
+                session.commit()
+
+    def _score_chunks(self, session: Session, job: PredictionJob) -> bool:
+        """Score the rest of the file; False if stopped before the end"""
+        import pandas as pd
+
+        mode = "r+b" if os.path.exists(job.output_path) else "wb"
+        with open(job.output_path, mode) as out:
+            # Drop anything written after the last chunk that was recorded
+            out.truncate(job.output_offset)
+            out.seek(job.output_offset)
+
+            reader = pd.read_csv(
+                job.input_path,
+                chunksize=self.chunk_rows,
+                skiprows=range(1, job.processed_rows + 1),
+            )
+            for chunk in reader:
+                if self._stop.is_set():
+                    return False
+                scored = self.score_fn(chunk)
+                if job.output_format == "ndjson":
+                    lines = scored.to_json(orient="records", lines=True)
+                    data = lines if lines.endswith("\n") else lines + "\n"
+                else:
+                    data = scored.to_csv(index=False, header=(job.processed_rows == 0))
+                out.write(data.encode("utf-8"))
+                out.flush()
+                os.fsync(out.fileno())
+
+                job.processed_rows += len(scored)
+                job.chunks_done += 1
+                job.output_offset = out.tell()
+                job.heartbeat_at = datetime.utcnow()
+                session.add(job)
+                session.commit()
+        return True
+
+
+def job_status(job: PredictionJob) -> dict:
+    """Client-facing view of a job"""
+    progress = None
+    if job.total_rows:
+        progress = round(min(job.processed_rows / job.total_rows, 1.0) * 100, 1)
+    elif job.status == "completed":
+        progress = 100.0
+    return {
+        "id": job.id,
+        "status": job.status,
+        "filename": job.filename,
+        "format": job.output_format,
+        "totalRows": job.total_rows,
+        "processedRows": job.processed_rows,
+        "chunksDone": job.chunks_done,
+        "progress": progress,
+        "error": job.error,
+        "createdAt": job.created_at,
+        "startedAt": job.started_at,
+        "finishedAt": job.finished_at,
+        "resultUrl": f"/api/predict/jobs/{job.id}/result" if job.status == "completed" else None,
+    }
@@ -0,0 +1,143 @@
+"""
+Process-pool inference for large batch uploads.
+
+Each worker process loads the model file once, in the pool initializer,
+behind the same inference backend as the web process, and scores whole
+shards of the encoded feature matrix. Large uploads are cut into shards
+of PREDICT_POOL_SHARD_SIZE rows; smaller matrices, such as the chunks of
+a streamed upload or a background job, are split evenly across the
+workers. Only the matrix shard goes out and
+only its probabilities come back; labels and risk levels are derived in
+the web process, so results match inline scoring.
+
+Workers are started with the "spawn" method: forking a web worker that
+already runs threads (uvicorn, XGBoost's OpenMP pool) is not safe.
+"""
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from app.ml.backends import PREDICT_BACKEND, load_backend
+
+logger = logging.getLogger(__name__)
+
+# Worker processes for batch scoring (0 disables the pool)
+PREDICT_POOL_WORKERS = int(os.getenv("PREDICT_POOL_WORKERS", "0"))
+
+# Largest shard sent to a worker
+PREDICT_POOL_SHARD_SIZE = int(os.getenv("PREDICT_POOL_SHARD_SIZE", "50000"))
+
+# Matrices with fewer rows are scored inline; the round trip costs more than it saves
+PREDICT_POOL_MIN_ROWS = int(os.getenv("PREDICT_POOL_MIN_ROWS", "2000"))
+
+# The backend loaded by the initializer of the current worker process
+_worker_backend = None
+
+
+def _init_worker(model_path: str, backend: str, threads: int) -> None:
+    global _worker_backend
+    # Share the cores between workers instead of every worker using all of them
+    _worker_backend = load_backend(backend, model_path, threads)
+
+
+def _worker_ready() -> int:
+    return os.getpid()
+
+
+def _predict_shard(matrix: np.ndarray) -> np.ndarray:
+    return _worker_backend.predict_proba(matrix)
+
+
+class InferencePool:
+    """Shards an encoded matrix across worker processes and merges the results in order"""
+
+    def __init__(
+        self,
+        model_path: str,
+        workers: int = PREDICT_POOL_WORKERS,
+        shard_size: int = PREDICT_POOL_SHARD_SIZE,
+        backend: str = PREDICT_BACKEND,
+        min_rows: int = PREDICT_POOL_MIN_ROWS,
+    ):
+        if workers < 1:
+            raise ValueError(f"An inference pool needs at least one worker, got {workers}")
+        self.model_path = model_path
+        self.backend = backend
+        self.workers = workers
+        self.shard_size = shard_size
+        self.min_rows = min_rows
+        self.threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+        self.batches = 0
+        self.rows = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Concurrent cold requests must not each start (and leak) a set of workers
+        self._lock = threading.Lock()
+
+    def start(self) -> "InferencePool":
+        """Start the workers and wait until each has loaded the model"""
+        with self._lock:
+            if self._executor is not None:
+                return self
+            started = time.perf_counter()
+            executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_path, self.backend, self.threads_per_worker),
+            )
+            try:
+                pids = {
+                    future.result()
+                    for future in [executor.submit(_worker_ready) for _ in range(self.workers)]
+                }
+            except BaseException:
+                executor.shutdown(cancel_futures=True)
+                raise
+            self._executor = executor
+            logger.info(
+                "Inference pool ready: %d workers (%d threads each) in %.2fs",
+                len(pids), self.threads_per_worker, time.perf_counter() - started,
+            )
+        return self
+
+    def handles(self, rows: int) -> bool:
+        """Whether a matrix of this many rows is worth sending to the workers"""
+        return rows >= self.min_rows
+
+    def predict_proba(self, matrix: np.ndarray) -> np.ndarray:
+        """Positive-class probabilities for an encoded matrix, in row order"""
+        self.start()
+        # A matrix smaller than workers x shard_size still keeps every worker busy
+        size = max(1, min(self.shard_size, math.ceil(len(matrix) / self.workers)))
+        shards = [matrix[start:start + size] for start in range(0, len(matrix), size)]
+        # map() yields results in submission order whatever order workers finish in
+        probabilities = np.concatenate(list(self._executor.map(_predict_shard, shards)))
+        self.batches += 1
+        self.rows += len(matrix)
+        return probabilities
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": True,
+            "running": self._executor is not None,
+            "workers": self.workers,
+            "backend": self.backend,
+            "threadsPerWorker": self.threads_per_worker,
+            "shardSize": self.shard_size,
+            "minRows": self.min_rows,
+            "batches": self.batches,
+            "rows": self.rows,
+        }
@@ -0,0 +1,183 @@
+"""
+Buffered prediction logging.
+
+The predict endpoints hand their results to PredictionWriter.record(),
+which only appends to an in-memory queue. A writer thread drains the
+queue and inserts the rows with executemany INSERTs of up to
+PREDICTION_LOG_BATCH_SIZE rows, at least every PREDICTION_LOG_FLUSH_SECONDS,
+so the request path never waits on the database. Each batch is added to
+the day/week rollups in the same transaction. A batch that fails to
+write stays queued and is retried after a growing pause (up to
+PREDICTION_LOG_RETRY_MAX_SECONDS). If the queue is full (the database
+has fallen far behind) new rows are dropped and counted rather than
+blocking requests.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+import numpy as np
+from sqlmodel import Session, insert
+
+from app.db.engine import engine
+from app.models.prediction import Prediction
+from app.analytics.prediction_rollup import apply_rollup, rollup_deltas
+
+logger = logging.getLogger(__name__)
+
+PREDICTION_LOG_ENABLED = os.getenv("PREDICTION_LOG", "true").lower() in ("1", "true", "yes")
+PREDICTION_LOG_BATCH_SIZE = int(os.getenv("PREDICTION_LOG_BATCH_SIZE", "1000"))
+PREDICTION_LOG_FLUSH_SECONDS = float(os.getenv("PREDICTION_LOG_FLUSH_SECONDS", "1"))
+PREDICTION_LOG_MAX_PENDING = int(os.getenv("PREDICTION_LOG_MAX_PENDING", "1000000"))
+PREDICTION_LOG_RETRY_MAX_SECONDS = float(os.getenv("PREDICTION_LOG_RETRY_MAX_SECONDS", "30"))
+
+
+def prediction_rows(
+    predictions: Iterable[int],
+    probabilities: Iterable[float],
+    risk_levels: Iterable[str],
+    model_version: Optional[str],
+    employee_ids: Optional[Iterable] = None,
+) -> List[dict]:
+    """Prediction table rows for a scored batch, all stamped with the current time"""
+    created_at = datetime.utcnow()
+    predictions = np.asarray(predictions).tolist()
+    probabilities = np.asarray(probabilities, dtype=float).tolist()
+    risk_levels = np.asarray(risk_levels).tolist()
+    if employee_ids is None:
+        employee_ids = [None] * len(predictions)
+    return [
+        {
+            "employee_id": employee_id,
+            "model_version": model_version,
+            "probability": probability,
+            "prediction": "Yes" if prediction else "No",
+            "risk_level": risk,
+            "created_at": created_at,
+        }
+        for prediction, probability, risk, employee_id
+        in zip(predictions, probabilities, risk_levels, employee_ids)
+    ]
+
+
+class PredictionWriter:
+    """Background thread that writes logged predictions in batches"""
+
+    def __init__(
+        self,
+        bind=engine,
+        batch_size: int = PREDICTION_LOG_BATCH_SIZE,
+        flush_seconds: float = PREDICTION_LOG_FLUSH_SECONDS,
+        max_pending: int = PREDICTION_LOG_MAX_PENDING,
+        retry_max_seconds: float = PREDICTION_LOG_RETRY_MAX_SECONDS,
+    ):
+        self.bind = bind
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self.retry_max_seconds = retry_max_seconds
+        self.pending = 0
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.errors = 0
+        self.retries = 0
+        self._queue: "queue.Queue[Optional[List[dict]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="prediction-log", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: float = 30) -> None:
+        """Write everything queued so far, then stop the thread"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def record(self, rows: List[dict]) -> None:
+        """Queue rows for writing; never blocks"""
+        if not rows:
+            return
+        with self._lock:
+            if self.pending + len(rows) > self.max_pending:
+                self.dropped += len(rows)
+                return
+            self.pending += len(rows)
+        self._queue.put(rows)
+        if self._thread is None:
+            self.start()
+
+    def _run(self) -> None:
+        buffer: List[dict] = []
+        deadline = time.monotonic() + self.flush_seconds
+        retry_at = 0.0
+        failures = 0
+        stopping = False
+        while not stopping:
+            try:
+                rows = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                if rows is None:
+                    stopping = True
+                else:
+                    buffer.extend(rows)
+            except queue.Empty:
+                pass
+            now = time.monotonic()
+            due = stopping or len(buffer) >= self.batch_size or now >= deadline
+            if buffer and due and (stopping or now >= retry_at):
+                if self._flush(buffer):
+                    buffer, failures = [], 0
+                elif stopping:
+                    self._discard(buffer)
+                else:
+                    # Keep the rows and try again after a growing pause
+                    failures += 1
+                    self.retries += 1
+                    retry_at = now + min(self.flush_seconds * 2 ** failures, self.retry_max_seconds)
+            if now >= deadline:
+                deadline = now + self.flush_seconds
+
+    def _flush(self, rows: List[dict]) -> bool:
+        """Write rows and their rollups in one transaction; False if it failed"""
+        try:
+            with Session(self.bind) as session:
+                for start in range(0, len(rows), self.batch_size):
+                    session.execute(insert(Prediction), rows[start:start + self.batch_size])
+                apply_rollup(session, rollup_deltas(rows))
+                session.commit()
+        except Exception:
+            self.errors += 1
+            logger.exception("Could not write %d predictions", len(rows))
+            return False
+        self.written += len(rows)
+        self.flushes += 1
+        with self._lock:
+            self.pending -= len(rows)
+        return True
+
+    def _discard(self, rows: List[dict]) -> None:
+        """Give up on rows that could not be written before shutdown"""
+        logger.error("Dropping %d predictions that could not be written before shutdown", len(rows))
+        self.dropped += len(rows)
+        with self._lock:
+            self.pending -= len(rows)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": True,
+            "pending": self.pending,
+            "written": self.written,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "errors": self.errors,
+            "retries": self.retries,
+        }
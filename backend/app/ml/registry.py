@@ -0,0 +1,331 @@
+"""
+Model registry and hot reload.
+
+train_model records every run in the `model` table (version, metrics and
+the artifact's content hash) through register_model().
+
+The web process serves predictions from a ModelHolder. Everything built
+from one model file (backend, scorer, micro-batcher, prediction cache and
+worker pool) lives in a single ModelState, and a reload builds a complete
+new state before swapping the holder's reference to it. Requests take a
+lease on the state they start with and keep it until they finish, so a
+request never sees two models; a replaced state is closed once its last
+lease is released.
+
+Reloads happen through POST /api/predict/model/reload or, when
+MODEL_WATCH_SECONDS is set, a thread that polls the model file.
+
+The first load happens at startup when MODEL_PRELOAD is on, otherwise
+when the first request needs the model, so workers that never predict
+never pay for XGBoost. With MODEL_WARMUP a freshly loaded model scores
+one row before it serves, pulling in pandas and any lazily initialised
+backend state ahead of the first real request.
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, Optional
+
+from sqlmodel import Session, select
+
+from app.ml.backends import PREDICT_BACKEND, load_backend
+from app.ml.batcher import MicroBatcher, MICROBATCH_ENABLED
+from app.ml.cache import PredictionCache, PREDICT_CACHE_SIZE, artifact_hash, file_signature, file_version
+from app.ml.pool import InferencePool, PREDICT_POOL_WORKERS
+from app.ml.scoring import AttritionScorer
+from app.models.model import Model
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the model file for changes (0 disables the watcher)
+MODEL_WATCH_SECONDS = float(os.getenv("MODEL_WATCH_SECONDS", "0"))
+
+# Load the model while the app starts instead of on the first prediction
+MODEL_PRELOAD = os.getenv("MODEL_PRELOAD", "true").lower() in ("1", "true", "yes")
+
+# Score one row with every newly loaded model before it serves requests
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "true").lower() in ("1", "true", "yes")
+
+
+def register_model(session: Session, model_path: str, **metrics) -> Model:
+    """
+    Record a trained model artifact in the registry. Registering the same
+    artifact again updates its metrics instead of adding a second row.
+    """
+    digest = artifact_hash(model_path)
+    entry = session.exec(select(Model).where(Model.artifact_hash == digest)).first()
+    if entry is None:
+        entry = Model(version=digest[:12], artifact_hash=digest)
+    entry.artifact_path = model_path
+    for name, value in metrics.items():
+        setattr(entry, name, value)
+    session.add(entry)
+    session.commit()
+    session.refresh(entry)
+    return entry
+
+
+def find_model(session: Session, version: str) -> Optional[Model]:
+    """The newest registry entry for a model version"""
+    return session.exec(
+        select(Model).where(Model.version == version).order_by(Model.id.desc())
+    ).first()
+
+
+class ModelState:
+    """One loaded model file and everything built on top of it"""
+
+    def __init__(
+        self,
+        model_path: str,
+        backend: str = PREDICT_BACKEND,
+        previous: Optional["ModelState"] = None,
+    ):
+        self.model_path = model_path
+        self.signature = file_signature(model_path)
+        self.version = file_version(model_path)
+        self.backend = load_backend(backend, model_path)
+        # Optional worker processes for large batch uploads (PREDICT_POOL_WORKERS=N)
+        self.pool = InferencePool(model_path, backend=backend) if PREDICT_POOL_WORKERS > 0 else None
+        self.scorer = AttritionScorer(self.backend, pool=self.pool)
+        # Optional micro-batching of concurrent /single requests (PREDICT_MICROBATCH=1).
+        # Batch-size counters carry over from the state this one replaces
+        self.batcher = (
+            MicroBatcher(
+                self.scorer.score,
+                histogram=previous.batcher.histogram if previous and previous.batcher else None,
+            )
+            if MICROBATCH_ENABLED else None
+        )
+        # Results of repeated what-if requests; a new model starts with an empty cache
+        self.cache = (
+            PredictionCache(model_path, self.version) if PREDICT_CACHE_SIZE > 0 else None
+        )
+        self.loaded_at = datetime.utcnow()
+        self.leases = 0
+        self.retired = False
+
+    def warm_up(self) -> None:
+        """Score one empty row through the batch path"""
+        import pandas as pd
+        from app.ml.features import encode_frame
+
+        self.scorer.score(encode_frame(pd.DataFrame([{}])))
+
+    def close(self) -> None:
+        if self.batcher is not None:
+            self.batcher.close()
+        if self.pool is not None:
+            self.pool.close()
+
+    def info(self) -> dict:
+        return {
+            "modelVersion": self.version,
+            "loadedAt": self.loaded_at.isoformat(),
+            **self.scorer.info(),
+        }
+
+
+class ModelHolder:
+    """Holds the current ModelState and swaps it atomically on reload"""
+
+    def __init__(
+        self,
+        model_path: str,
+        backend: str = PREDICT_BACKEND,
+        watch_seconds: float = MODEL_WATCH_SECONDS,
+        warm_up: bool = MODEL_WARMUP,
+    ):
+        self.model_path = model_path
+        self.backend = backend
+        self.watch_seconds = watch_seconds
+        self.warm_up = warm_up
+        self.current: Optional[ModelState] = None
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+        self._load_attempted = False
+        self._failed_signature: Optional[tuple] = None
+        self._lock = threading.Lock()
+        # Serialises reloads so two of them never build states at once
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def load(self) -> Optional[ModelState]:
+        """Load the model file for the first time; None (and a warning) if it cannot be read"""
+        self._load_attempted = True
+        started = time.perf_counter()
+        try:
+            state = ModelState(self.model_path, self.backend)
+            if self.warm_up:
+                state.warm_up()
+        except Exception as e:
+            self.last_error = str(e)
+            self._failed_signature = file_signature(self.model_path)
+            print(f"⚠ Warning: Could not load model file: {e}")
+            return None
+        self.current = state
+        print(
+            f"✓ Model loaded successfully (version {state.version}, {state.backend.name} backend)"
+            f" in {time.perf_counter() - started:.2f}s"
+        )
+        return state
+
+    def get(self) -> Optional[ModelState]:
+        """
+        The current state, loading the model file first if nothing is loaded.
+        After a failed load the file is only tried again once it changes.
+        """
+        state = self.current
+        if state is not None:
+            return state
+        with self._reload_lock:
+            if self.current is None and (
+                not self._load_attempted
+                or file_signature(self.model_path) != self._failed_signature
+            ):
+                self.load()
+        return self.current
+
+    def start(self, preload: bool = MODEL_PRELOAD) -> None:
+        """
+        Load the model (unless preload is off), start its worker pool and,
+        if configured, the file watcher
+        """
+        state = self.get() if preload else self.current
+        if state is not None and state.pool is not None:
+            state.pool.start()
+        if self.watch_seconds > 0 and (self._thread is None or not self._thread.is_alive()):
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name="model-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._lock:
+            state, self.current = self.current, None
+        if state is not None:
+            state.close()
+
+    def reload(self, force: bool = False) -> dict:
+        """
+        Load the model file into a new state and make it current. Unless
+        `force` is set nothing is swapped when the file's content hash
+        matches the loaded version. Raises if the file cannot be loaded;
+        the current model keeps serving in that case.
+        """
+        with self._reload_lock:
+            previous = self.current
+            if not force and previous is not None and file_version(self.model_path) == previous.version:
+                previous.signature = file_signature(self.model_path)
+                self.last_error = None
+                return {"reloaded": False, "previousVersion": previous.version, "modelVersion": previous.version}
+
+            started = time.perf_counter()
+            state = None
+            try:
+                state = ModelState(self.model_path, self.backend, previous)
+                if state.pool is not None:
+                    # Workers load the new model before any request can reach them
+                    state.pool.start()
+                if self.warm_up:
+                    state.warm_up()
+            except Exception as e:
+                self.last_error = str(e)
+                if state is not None:
+                    state.close()
+                raise
+
+            with self._lock:
+                self.current = state
+                self.reloads += 1
+                self.last_error = None
+            if previous is not None:
+                self._retire(previous)
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "Model reloaded: %s -> %s in %.2fs",
+            previous.version if previous else None, state.version, elapsed,
+        )
+        return {
+            "reloaded": True,
+            "previousVersion": previous.version if previous else None,
+            "modelVersion": state.version,
+            "seconds": round(elapsed, 3),
+        }
+
+    def acquire(self) -> Optional[ModelState]:
+        """
+        The current state, kept open until release() even if a reload
+        replaces it meanwhile. Loads the model if this is its first use;
+        None when it cannot be loaded.
+        """
+        self.get()
+        with self._lock:
+            state = self.current
+            if state is not None:
+                state.leases += 1
+        return state
+
+    def release(self, state: Optional[ModelState]) -> None:
+        if state is None:
+            return
+        with self._lock:
+            state.leases -= 1
+            closing = state.retired and state.leases == 0
+        if closing:
+            self._close_later(state)
+
+    @contextmanager
+    def lease(self) -> Iterator[Optional[ModelState]]:
+        """acquire() and release() around a block"""
+        state = self.acquire()
+        try:
+            yield state
+        finally:
+            self.release(state)
+
+    def _retire(self, state: ModelState) -> None:
+        with self._lock:
+            state.retired = True
+            closing = state.leases == 0
+        if closing:
+            self._close_later(state)
+
+    @staticmethod
+    def _close_later(state: ModelState) -> None:
+        # Shutting down a worker pool blocks; keep it off the request path
+        threading.Thread(target=state.close, name="model-retire", daemon=True).start()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.watch_seconds):
+            state = self.current
+            signature = file_signature(self.model_path)
+            if signature is None or signature == self._failed_signature:
+                continue
+            if state is not None and signature == state.signature:
+                continue
+            try:
+                self.reload()
+            except Exception as e:
+                # A half-written file fails to load; it is retried once it changes again
+                self._failed_signature = signature
+                logger.warning("Model reload from %s failed: %s", self.model_path, e)
+
+    def stats(self) -> dict:
+        state = self.current
+        return {
+            "loaded": state is not None,
+            "modelVersion": state.version if state else None,
+            "loadedAt": state.loaded_at.isoformat() if state else None,
+            "reloads": self.reloads,
+            "watchSeconds": self.watch_seconds,
+            "lastError": self.last_error,
+        }
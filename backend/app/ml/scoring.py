@@ -0,0 +1,89 @@
+import os
+
+import numpy as np
+
+from app.ml.backends import InferenceBackend, SklearnBackend
+
+# Rows per predict_proba call when scoring uploads
+BATCH_CHUNK_SIZE = int(os.getenv("PREDICT_BATCH_CHUNK_SIZE", "10000"))
+
+# Probability at or above which an employee is labelled as leaving
+DECISION_THRESHOLD = float(os.getenv("PREDICTION_THRESHOLD", "0.5"))
+
+# Probability bands used for riskLevel: < 0.3 Low, < 0.7 Medium, else High
+RISK_BANDS = (0.3, 0.7)
+
+
+def risk_level(probability: float) -> str:
+    """Map a single attrition probability to its risk level"""
+    low, high = RISK_BANDS
+    if probability < low:
+        return "Low"
+    if probability < high:
+        return "Medium"
+    return "High"
+
+
+def risk_levels(probabilities: np.ndarray) -> np.ndarray:
+    """Vectorised risk_level for an array of probabilities"""
+    low, high = RISK_BANDS
+    return np.select(
+        [probabilities < low, probabilities < high],
+        ["Low", "Medium"],
+        default="High",
+    )
+
+
+class AttritionScorer:
+    """
+    Inference wrapper around the loaded model's backend.
+
+    Runs predict_proba once per chunk and derives the class label from
+    `threshold` and the riskLevel from RISK_BANDS, so label, probability
+    and risk level always come from the same pass over the trees. With an
+    InferencePool, matrices of at least PREDICT_POOL_MIN_ROWS rows (whole
+    uploads as well as stream and job chunks) are scored by the pool's
+    worker processes instead.
+    """
+
+    def __init__(self, backend, threshold: float = DECISION_THRESHOLD, chunk_size: int = BATCH_CHUNK_SIZE, pool=None):
+        if not 0.0 < threshold < 1.0:
+            raise ValueError(f"Decision threshold must be between 0 and 1, got {threshold}")
+        # A bare model (e.g. an XGBClassifier) is scored through its predict_proba
+        if not isinstance(backend, InferenceBackend):
+            backend = SklearnBackend(backend)
+        self.backend = backend
+        self.threshold = threshold
+        self.chunk_size = chunk_size
+        self.pool = pool
+
+    def predict_proba(self, matrix: np.ndarray) -> np.ndarray:
+        """Positive-class probabilities for an encoded matrix"""
+        if self.pool is not None and self.pool.handles(len(matrix)):
+            return self.pool.predict_proba(matrix)
+        probabilities = np.empty(len(matrix), dtype=np.float64)
+        for start in range(0, len(matrix), self.chunk_size):
+            stop = start + self.chunk_size
+            probabilities[start:stop] = self.backend.predict_proba(matrix[start:stop])
+        return probabilities
+
+    def label(self, probabilities: np.ndarray) -> np.ndarray:
+        """Class labels (1 = leaving) for an array of probabilities"""
+        return (probabilities >= self.threshold).astype(int)
+
+    def score(self, matrix: np.ndarray):
+        """Score an encoded matrix and return (predictions, probabilities, risk levels)"""
+        probabilities = self.predict_proba(matrix)
+        return self.label(probabilities), probabilities, risk_levels(probabilities)
+
+    def score_one(self, row: np.ndarray):
+        """Score a single encoded row and return (prediction, probability, risk level)"""
+        probability = float(self.backend.predict_proba(row)[0])
+        return int(probability >= self.threshold), probability, risk_level(probability)
+
+    def info(self) -> dict:
+        return {
+            **self.backend.info(),
+            "threshold": self.threshold,
+            "riskBands": {"low": RISK_BANDS[0], "high": RISK_BANDS[1]},
+        }
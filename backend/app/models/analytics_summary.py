@@ -0,0 +1,10 @@
+from sqlmodel import SQLModel, Field
+
+class AnalyticsSummary(SQLModel, table=True):
+    """Materialized per-group employee and attrition counts"""
+    __tablename__ = "analytics_summary"
+    
+    dimension: str = Field(primary_key=True)  # "department", "job_role" or "salary_range"
+    bucket: str = Field(primary_key=True)
+    total: int = 0
+    attrition: int = 0
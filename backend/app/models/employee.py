@@ -1,7 +1,15 @@
-from sqlmodel import SQLModel, Field
+from sqlmodel import SQLModel, Field, Index
 from typing import Optional
 
 class Employee(SQLModel, table=True):
+    # Filter columns are indexed together with id so that keyset pages
+    # (WHERE col = ? AND id > ? ORDER BY id) are a single index range scan
+    __table_args__ = (
+        Index("ix_employee_department_id", "department", "id"),
+        Index("ix_employee_job_role_id", "job_role", "id"),
+        Index("ix_employee_attrition_id", "attrition", "id"),
+    )
+    
     id: Optional[int] = Field(primary_key=True)
     age: int
     business_travel: Optional[str] = None
@@ -11,7 +19,7 @@ class Employee(SQLModel, table=True):
     education: Optional[int] = None
     education_field: Optional[str] = None
     employee_count: int = 1
-    employee_number: Optional[int] = None
+    employee_number: Optional[int] = Field(default=None, index=True)
     environment_satisfaction: Optional[int] = None
     gender: Optional[str] = None
     hourly_rate: Optional[int] = None
@@ -1,13 +1,18 @@
 from sqlmodel import SQLModel, Field
 from typing import Optional
+from datetime import datetime
 
 class Model(SQLModel, table=True):
+    """A trained model artifact recorded by train_model"""
     __tablename__ = "model"  # Explicitly set table name
     
-    id: Optional[int] = Field(primary_key=True)
-    version: str
+    id: Optional[int] = Field(default=None, primary_key=True)
+    version: str = Field(index=True)  # First 12 characters of artifact_hash
     accuracy: Optional[float] = None
     precision: Optional[float] = None
     recall: Optional[float] = None
     f1: Optional[float] = None
-    training_data_size: Optional[int] = None
\ No newline at end of file
+    training_data_size: Optional[int] = None
+    artifact_path: Optional[str] = None
+    artifact_hash: Optional[str] = Field(default=None, index=True)  # sha256 of the pickle
+    created_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
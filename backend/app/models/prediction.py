@@ -1,15 +1,19 @@
-from sqlmodel import SQLModel, Field
+from sqlmodel import SQLModel, Field, Index
 from typing import Optional
 from datetime import datetime
 
 class Prediction(SQLModel, table=True):
     __tablename__ = "prediction"
+    __table_args__ = (
+        # History is paged newest first by (created_at, id)
+        Index("ix_prediction_created_at_id", "created_at", "id"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
-    employee_id: Optional[int] = None  # No foreign key constraint
+    employee_id: Optional[int] = Field(default=None, index=True)  # No foreign key constraint
     model_version: Optional[str] = None  # Store version string instead
     probability: float
     prediction: str  # "Yes" or "No" for attrition
     risk_level: Optional[str] = None  # "Low", "Medium", "High"
     feedback: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
\ No newline at end of file
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,24 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+
+class PredictionJob(SQLModel, table=True):
+    """A batch prediction file queued for background scoring"""
+    __tablename__ = "prediction_job"
+    
+    id: str = Field(primary_key=True)  # uuid4 hex
+    status: str = Field(default="queued", index=True)  # "queued", "running", "completed", "failed"
+    filename: Optional[str] = None
+    output_format: str = "ndjson"  # "ndjson" or "csv"
+    input_path: str
+    output_path: str
+    total_rows: Optional[int] = None
+    processed_rows: int = 0
+    chunks_done: int = 0
+    output_offset: int = 0  # bytes of output covering the finished chunks
+    error: Optional[str] = None
+    claimed_by: Optional[str] = None  # "host:pid" of the worker running it
+    heartbeat_at: Optional[datetime] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,13 @@
+from sqlmodel import SQLModel, Field
+from datetime import date
+
+class PredictionRollup(SQLModel, table=True):
+    """Prediction counts per day or week and risk level"""
+    __tablename__ = "prediction_rollup"
+    
+    granularity: str = Field(primary_key=True)  # "day" or "week"
+    period_start: date = Field(primary_key=True)  # the day, or the Monday of the week
+    risk_level: str = Field(primary_key=True)  # "Low", "Medium", "High"
+    count: int = 0
+    predicted_leaving: int = 0  # predictions of "Yes"
+    probability_sum: float = 0.0
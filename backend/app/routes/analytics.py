@@ -1,31 +1,57 @@
-from fastapi import APIRouter, Depends
-from sqlmodel import Session, select, func
-from app.db.session import get_session
-from app.models.employee import Employee
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.session import get_async_session
+from app.db.profiling import profile_statements
+from app.analytics.queries import SALARY_RANGES, dashboard_statement
+from app.analytics.summary import read_summary, summary_statement
+from app.analytics.cube import (
+    CUBE_DIMENSIONS,
+    cube_statement,
+    compute_cube,
+    parse_filter,
+    cube_cache_stats,
+)
 
 router = APIRouter()
 
+
+def attrition_stats(total: int, attrition: int) -> dict:
+    """total / attrition / attritionRate fields shared by the breakdown endpoints"""
+    attrition = attrition or 0
+    attrition_rate = (attrition / total * 100) if total > 0 else 0
+    return {
+        "total": total,
+        "attrition": attrition,
+        "attritionRate": round(attrition_rate, 2)
+    }
+
+
+# Statements behind each endpoint, for the /profile harness
+PROFILED_QUERIES = {
+    "dashboard": [dashboard_statement],
+    "department": [lambda: summary_statement("department")],
+    "role": [lambda: summary_statement("job_role")],
+    "salary": [lambda: summary_statement("salary_range")],
+    "cube": [lambda: cube_statement(["department", "over_time"], {})],
+}
+
+
 @router.get("/dashboard")
-def get_dashboard_stats(session: Session = Depends(get_session)):
+async def get_dashboard_stats(session: AsyncSession = Depends(get_async_session)):
     """Get dashboard statistics"""
-    total_employees = session.exec(select(func.count(Employee.id))).one()
-    
-    # Attrition rate
-    attrition_count = session.exec(
-        select(func.count(Employee.id)).where(Employee.attrition == "Yes")
-    ).one()
+    (
+        total_employees,
+        attrition_count,
+        avg_age,
+        avg_salary,
+        avg_satisfaction,
+    ) = (await session.exec(dashboard_statement())).one()
+    
+    attrition_count = attrition_count or 0
     attrition_rate = (attrition_count / total_employees * 100) if total_employees > 0 else 0
-    
-    # Average age
-    avg_age = session.exec(select(func.avg(Employee.age))).one() or 0
-    
-    # Average salary
-    avg_salary = session.exec(select(func.avg(Employee.monthly_income))).one() or 0
-    
-    # Average job satisfaction
-    avg_satisfaction = session.exec(
-        select(func.avg(Employee.job_satisfaction))
-    ).one() or 0
+    avg_age = avg_age or 0
+    avg_salary = avg_salary or 0
+    avg_satisfaction = avg_satisfaction or 0
     
     return {
         "totalEmployees": total_employees,
@@ -37,94 +63,94 @@ def get_dashboard_stats(session: Session = Depends(get_session)):
 
 
 @router.get("/department")
-def get_department_analytics(session: Session = Depends(get_session)):
+async def get_department_analytics(session: AsyncSession = Depends(get_async_session)):
     """Get analytics by department"""
-    employees = session.exec(select(Employee)).all()
-    
-    dept_stats = {}
-    for emp in employees:
-        dept = emp.department or "Unknown"
-        if dept not in dept_stats:
-            dept_stats[dept] = {"total": 0, "attrition": 0}
-        
-        dept_stats[dept]["total"] += 1
-        if emp.attrition == "Yes":
-            dept_stats[dept]["attrition"] += 1
-    
-    result = []
-    for dept, stats in dept_stats.items():
-        attrition_rate = (stats["attrition"] / stats["total"] * 100) if stats["total"] > 0 else 0
-        result.append({
-            "department": dept,
-            "total": stats["total"],
-            "attrition": stats["attrition"],
-            "attritionRate": round(attrition_rate, 2)
-        })
-    
-    return result
+    counts = await session.run_sync(read_summary, "department")
+    return [
+        {"department": department, **attrition_stats(total, attrition)}
+        for department, (total, attrition) in counts.items()
+    ]
 
 
 @router.get("/salary")
-def get_salary_analytics(session: Session = Depends(get_session)):
+async def get_salary_analytics(session: AsyncSession = Depends(get_async_session)):
     """Get analytics by salary range"""
-    employees = session.exec(select(Employee)).all()
+    counts = await session.run_sync(read_summary, "salary_range")
     
-    # Define salary ranges
-    ranges = [
-        (0, 30000, "0-30k"),
-        (30000, 60000, "30k-60k"),
-        (60000, 90000, "60k-90k"),
-        (90000, 120000, "90k-120k"),
-        (120000, float('inf'), "120k+")
+    # Every range is reported, including empty ones, in ascending order
+    return [
+        {"range": label, **attrition_stats(*counts.get(label, (0, 0)))}
+        for _, _, label in SALARY_RANGES
     ]
-    
-    salary_stats = {label: {"total": 0, "attrition": 0} for _, _, label in ranges}
-    
-    for emp in employees:
-        salary = emp.monthly_income or 0
-        for min_sal, max_sal, label in ranges:
-            if min_sal <= salary < max_sal:
-                salary_stats[label]["total"] += 1
-                if emp.attrition == "Yes":
-                    salary_stats[label]["attrition"] += 1
-                break
-    
-    result = []
-    for label, stats in salary_stats.items():
-        attrition_rate = (stats["attrition"] / stats["total"] * 100) if stats["total"] > 0 else 0
-        result.append({
-            "range": label,
-            "total": stats["total"],
-            "attrition": stats["attrition"],
-            "attritionRate": round(attrition_rate, 2)
-        })
-    
-    return result
 
 
 @router.get("/role")
-def get_role_analytics(session: Session = Depends(get_session)):
+async def get_role_analytics(session: AsyncSession = Depends(get_async_session)):
     """Get analytics by job role"""
-    employees = session.exec(select(Employee)).all()
-    
-    role_stats = {}
-    for emp in employees:
-        role = emp.job_role or "Unknown"
-        if role not in role_stats:
-            role_stats[role] = {"total": 0, "attrition": 0}
-        
-        role_stats[role]["total"] += 1
-        if emp.attrition == "Yes":
-            role_stats[role]["attrition"] += 1
-    
-    result = []
-    for role, stats in role_stats.items():
-        attrition_rate = (stats["attrition"] / stats["total"] * 100) if stats["total"] > 0 else 0
-        result.append({
-            "role": role,
-            "total": stats["total"],
-            "attrition": stats["attrition"],
-            "attritionRate": round(attrition_rate, 2)
-        })
+    counts = await session.run_sync(read_summary, "job_role")
+    result = [
+        {"role": role, **attrition_stats(total, attrition)}
+        for role, (total, attrition) in counts.items()
+    ]
+    return sorted(result, key=lambda x: x["total"], reverse=True)
+
+
+@router.get("/cube")
+async def get_attrition_cube(
+    request: Request,
+    dims: str = Query("", description="Comma-separated dimensions to group by"),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Get employee and attrition counts grouped by any set of dimensions.
+
+    Example: /cube?dims=department,over_time&job_level=1,2 groups by
+    department and overtime for employees at job level 1 or 2. Any
+    dimension name can be passed as a filter with comma-separated values.
+    """
+    dimensions = [name.strip() for name in dims.split(",") if name.strip()]
+    unknown = [name for name in dimensions if name not in CUBE_DIMENSIONS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown dimensions: {', '.join(unknown)}. Choose from: {', '.join(CUBE_DIMENSIONS)}"
+        )
+    if len(set(dimensions)) != len(dimensions):
+        raise HTTPException(status_code=400, detail="Dimensions must not repeat")
+    
+    try:
+        filters = {
+            name: parse_filter(name, value)
+            for name, value in request.query_params.items()
+            if name in CUBE_DIMENSIONS
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid filter value: {e}")
     
-    return sorted(result, key=lambda x: x["total"], reverse=True)
\ No newline at end of file
+    return {
+        "dimensions": dimensions,
+        "filters": filters,
+        "cells": await session.run_sync(compute_cube, dimensions, filters)
+    }
+
+
+@router.get("/cube/stats")
+def get_cube_cache_stats():
+    """Get hit/miss counters for the cube result cache"""
+    return cube_cache_stats()
+
+
+@router.get("/profile/{name}")
+async def profile_analytics_query(
+    name: str,
+    runs: int = Query(5, ge=1, le=100),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Show the SQL, query plan and DB time behind an analytics endpoint"""
+    if name not in PROFILED_QUERIES:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown query '{name}'. Choose from: {', '.join(PROFILED_QUERIES)}"
+        )
+    statements = [build() for build in PROFILED_QUERIES[name]]
+    return {"name": name, **await session.run_sync(profile_statements, statements, runs)}
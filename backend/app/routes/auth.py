@@ -1,14 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlmodel import Session, select
-import bcrypt
+from sqlalchemy import event, inspect
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional
 from pydantic import BaseModel, EmailStr
 import os
+import threading
+import time
 
-from app.db.session import get_session as get_db
+from app.cache import LRUTTLCache
+from app.hashing import password_hasher, HasherSaturated
+from app.db.session import get_async_session
 from app.models.user import User
 
 router = APIRouter()
@@ -20,6 +25,16 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# Verified token -> user, so authenticated requests skip the user lookup
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+principal_cache = LRUTTLCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL)
+
+# email -> generation; invalidate_user() bumps it so that user's cached
+# entries stop matching without scanning the cache for their tokens
+_user_generations: Dict[str, int] = {}
+_generations_lock = threading.Lock()
+
 
 # Pydantic models
 class UserRegister(BaseModel):
@@ -49,21 +64,14 @@ class UserResponse(BaseModel):
 
 
 # Helper functions
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return bcrypt.checkpw(
-        plain_password.encode('utf-8'),
-        hashed_password.encode('utf-8')
+def hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many sign-in requests, please retry shortly",
+        headers={"Retry-After": "1"},
     )
 
 
-def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt"""
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed.decode('utf-8')
-
-
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=15))
@@ -71,15 +79,36 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def invalidate_user(email: str) -> None:
+    """Drop every cached principal of a user; call after changing or deleting them"""
+    with _generations_lock:
+        _user_generations[email] = _user_generations.get(email, 0) + 1
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target):
+    # Covers the old address too when the email itself changed
+    for email in {target.email, *inspect(target).attrs.email.history.deleted}:
+        invalidate_user(email)
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_session)
 ) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    cached = principal_cache.get(token)
+    if cached is not None:
+        user, email, generation, expires = cached
+        if generation == _user_generations.get(email, 0) and expires > time.time():
+            return user
+        principal_cache.pop(token)
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
@@ -88,25 +117,33 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.exec(select(User).where(User.email == email)).first()
+    # Read before the lookup, so a change made meanwhile invalidates this entry
+    generation = _user_generations.get(email, 0)
+    user = (await db.exec(select(User).where(User.email == email))).first()
     if user is None:
         raise credentials_exception
+    
+    db.expunge(user)
+    principal_cache.set(token, (user, email, generation, payload.get("exp", 0)))
     return user
 
 
 # Routes
 @router.post("/register", response_model=Token)
-def register(user_data: UserRegister, db: Session = Depends(get_db)):
+async def register(user_data: UserRegister, db: AsyncSession = Depends(get_async_session)):
     # Check if user exists
-    existing_user = db.exec(select(User).where(User.email == user_data.email)).first()
+    existing_user = (await db.exec(select(User).where(User.email == user_data.email))).first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    # Create new user; bcrypt runs on its own bounded pool
+    try:
+        hashed_password = await password_hasher.hash(user_data.password)
+    except HasherSaturated:
+        raise hashing_busy()
     new_user = User(
         name=user_data.name,
         email=user_data.email,
@@ -116,8 +153,8 @@ def register(user_data: UserRegister, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     # Create token
     access_token = create_access_token(
@@ -138,10 +175,15 @@ def register(user_data: UserRegister, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-def login(user_data: UserLogin, db: Session = Depends(get_db)):
-    user = db.exec(select(User).where(User.email == user_data.email)).first()
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_async_session)):
+    user = (await db.exec(select(User).where(User.email == user_data.email))).first()
     
-    if not user or not verify_password(user_data.password, user.password_hash):
+    try:
+        valid = user is not None and await password_hasher.verify(user_data.password, user.password_hash)
+    except HasherSaturated:
+        raise hashing_busy()
+    
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -172,4 +214,16 @@ def get_me(current_user: User = Depends(get_current_user)):
         email=current_user.email,
         department=current_user.department,
         role=current_user.role
-    )
\ No newline at end of file
+    )
+
+
+@router.get("/cache/stats")
+def get_auth_cache_stats():
+    """Get hit/miss counters for the token -> user cache"""
+    return principal_cache.stats()
+
+
+@router.get("/hashing/stats")
+def get_hashing_stats():
+    """Get queue depth and timing for the bcrypt executor"""
+    return password_hasher.stats()
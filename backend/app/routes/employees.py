@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select, or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, File
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Optional, List
 from pydantic import BaseModel
 
-from app.db.session import get_session
+from app.db.session import get_session, get_async_session
 from app.models.employee import Employee
+from app.analytics.summary import record_change, summary_values
+from app.analytics.cube import invalidate_cube_cache
+from app.db.search import SEARCH_FIELDS, apply_search, index_employees, unindex_employees
+from app.db.bulk import read_employee_file, upsert_employees, update_employees, delete_employees
 
 router = APIRouter()
 
@@ -80,27 +85,49 @@ class EmployeeUpdate(BaseModel):
     attrition: Optional[str] = None
 
 
+class EmployeePatch(EmployeeUpdate):
+    id: int
+
+
+class BulkUpdateRequest(BaseModel):
+    items: List[EmployeePatch]
+
+
+class BulkDeleteRequest(BaseModel):
+    ids: Optional[List[int]] = None
+    department: Optional[str] = None
+    attrition: Optional[bool] = None
+
+
+class BulkItemStatus(BaseModel):
+    id: int
+    status: str  # "updated", "unchanged", "deleted" or "not_found"
+
+
 @router.get("/", response_model=List[Employee])
-def list_employees(
+async def list_employees(
     *,
-    session: Session = Depends(get_session),
-    limit: int = Query(50, le=500),
-    search: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session),
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[int] = Query(None, ge=0, description="Return employees with id greater than this"),
+    search: Optional[str] = Query(None, description="Prefix search over role, department, education field and employee number"),
     department: Optional[str] = None,
     attrition: Optional[bool] = None
 ):
-    """List employees with optional filters"""
+    """
+    List employees with optional filters.
+    
+    Results are ordered by id and paged by keyset: when more rows exist the
+    X-Next-Cursor response header holds the value to pass as `cursor` for
+    the next page, so every page costs the same index range scan.
+    
+    With `search`, the best `limit` matches from the search index are
+    returned by relevance instead, and no cursor is issued.
+    """
     query = select(Employee)
     
     # Apply filters
-    if search:
-        query = query.where(
-            or_(
-                Employee.job_role.contains(search),
-                Employee.department.contains(search)
-            )
-        )
-    
     if department:
         query = query.where(Employee.department == department)
     
@@ -108,62 +135,141 @@ def list_employees(
         attrition_str = "Yes" if attrition else "No"
         query = query.where(Employee.attrition == attrition_str)
     
-    query = query.limit(limit)
-    employees = session.exec(query).all()
+    if search:
+        query = (await session.run_sync(apply_search, query, search)).limit(limit)
+        return (await session.exec(query)).all()
+    
+    if cursor is not None:
+        query = query.where(Employee.id > cursor)
+    
+    # Fetch one extra row to know whether there is a next page
+    query = query.order_by(Employee.id).limit(limit + 1)
+    employees = (await session.exec(query)).all()
+    
+    if len(employees) > limit:
+        employees = employees[:limit]
+        response.headers["X-Next-Cursor"] = str(employees[-1].id)
     return employees
 
 
 @router.get("/{emp_id}", response_model=Employee)
-def get_employee(emp_id: int, session: Session = Depends(get_session)):
+async def get_employee(emp_id: int, session: AsyncSession = Depends(get_async_session)):
     """Get a single employee by ID"""
-    emp = session.get(Employee, emp_id)
+    emp = await session.get(Employee, emp_id)
     if not emp:
         raise HTTPException(status_code=404, detail="Employee not found")
     return emp
 
 
 @router.post("/", response_model=Employee)
-def create_employee(
+async def create_employee(
     employee_data: EmployeeCreate,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Create a new employee"""
     employee = Employee(**employee_data.dict())
     session.add(employee)
-    session.commit()
-    session.refresh(employee)
+    await session.flush()
+    await session.run_sync(record_change, after=summary_values(employee))
+    await session.run_sync(index_employees, [employee])
+    await session.commit()
+    invalidate_cube_cache()
+    await session.refresh(employee)
     return employee
 
 
+@router.post("/bulk")
+def bulk_import_employees(
+    file: UploadFile = File(...),
+    session: Session = Depends(get_session)
+):
+    """
+    Import employees from a CSV or Parquet file.
+    
+    Columns may be PascalCase (as in the IBM dataset) or snake_case. Rows
+    whose employee_number already exists are updated, the rest inserted.
+    Parsing the file is CPU-bound, so this stays a sync handler and runs in
+    the threadpool with a sync session.
+    """
+    try:
+        df = read_employee_file(file.file, file.filename or "")
+        return upsert_employees(session, df)
+    except (ValueError, ImportError) as e:
+        session.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.patch("/bulk", response_model=List[BulkItemStatus])
+async def bulk_update_employees(
+    request: BulkUpdateRequest,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Apply partial updates to many employees in one transaction"""
+    patches = [item.dict(exclude_unset=True) for item in request.items]
+    return await session.run_sync(update_employees, patches)
+
+
+@router.post("/bulk/delete", response_model=List[BulkItemStatus])
+async def bulk_delete_employees(
+    request: BulkDeleteRequest,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Delete many employees in one transaction, by id list, by filter
+    (department / attrition) or by ids that also match the filter.
+    """
+    filters = []
+    if request.department is not None:
+        filters.append(Employee.department == request.department)
+    if request.attrition is not None:
+        filters.append(Employee.attrition == ("Yes" if request.attrition else "No"))
+    
+    if request.ids is None and not filters:
+        raise HTTPException(
+            status_code=400,
+            detail="Pass ids and/or a filter; refusing to delete every employee"
+        )
+    return await session.run_sync(delete_employees, request.ids, filters)
+
+
 @router.put("/{emp_id}", response_model=Employee)
-def update_employee(
+async def update_employee(
     emp_id: int,
     employee_data: EmployeeUpdate,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Update an existing employee"""
-    employee = session.get(Employee, emp_id)
+    employee = await session.get(Employee, emp_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
     
+    before = summary_values(employee)
+    
     # Update only provided fields
     update_data = employee_data.dict(exclude_unset=True)
     for key, value in update_data.items():
         setattr(employee, key, value)
     
     session.add(employee)
-    session.commit()
-    session.refresh(employee)
+    await session.run_sync(record_change, before=before, after=summary_values(employee))
+    if any(field in update_data for field in SEARCH_FIELDS):
+        await session.run_sync(index_employees, [employee])
+    await session.commit()
+    invalidate_cube_cache()
+    await session.refresh(employee)
     return employee
 
 
 @router.delete("/{emp_id}")
-def delete_employee(emp_id: int, session: Session = Depends(get_session)):
+async def delete_employee(emp_id: int, session: AsyncSession = Depends(get_async_session)):
     """Delete an employee"""
-    employee = session.get(Employee, emp_id)
+    employee = await session.get(Employee, emp_id)
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
     
-    session.delete(employee)
-    session.commit()
+    await session.run_sync(record_change, before=summary_values(employee))
+    await session.run_sync(unindex_employees, [emp_id])
+    await session.delete(employee)
+    await session.commit()
+    invalidate_cube_cache()
     return {"message": "Employee deleted successfully"}
\ No newline at end of file
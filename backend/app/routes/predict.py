@@ -1,113 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Response
+from fastapi.responses import StreamingResponse, FileResponse
+from starlette.concurrency import run_in_threadpool
+from sqlmodel import Session, select, tuple_
 from pydantic import BaseModel
-from typing import Optional, List, Dict
-import pandas as pd
-import joblib
-import io
+from typing import TYPE_CHECKING, Optional, List, Dict, Iterator, BinaryIO
+from datetime import date, datetime
+import itertools
+import json
+import os
 import traceback
 
 from app.db.session import get_session
 from app.models.employee import Employee
 from app.models.prediction import Prediction
+from app.ml.features import (
+    LABEL_ENCODINGS,
+    COLUMN_MAPPING,
+    EXPECTED_FEATURES,
+    encode_frame,
+    feature_encoder,
+)
+from app.ml.registry import ModelHolder, ModelState, find_model
+from app.ml.scoring import DECISION_THRESHOLD
+from app.models.model import Model
+from app.ml.jobs import JobRunner, create_job, job_status
+from app.ml.prediction_log import PredictionWriter, PREDICTION_LOG_ENABLED, prediction_rows
+from app.analytics.prediction_rollup import read_rollup
+from app.models.prediction_job import PredictionJob
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 router = APIRouter()
 
-# Hard-coded label encodings (matching your training data)
-LABEL_ENCODINGS = {
-    "BusinessTravel": {"Non-Travel": 0, "Travel_Rarely": 1, "Travel_Frequently": 2},
-    "Department": {
-        "Sales": 0,
-        "Research & Development": 1,
-        "Human Resources": 2,
-        "IT": 3,
-        "Finance": 4,
-        "Marketing": 5,
-        "Operations": 6,
-    },
-    "EducationField": {
-        "Life Sciences": 0,
-        "Medical": 1,
-        "Marketing": 2,
-        "Technical Degree": 3,
-        "Other": 4,
-        "Human Resources": 5,
-    },
-    "Gender": {"Female": 0, "Male": 1},
-    "JobRole": {
-        "Sales Executive": 0,
-        "Research Scientist": 1,
-        "Laboratory Technician": 2,
-        "Manufacturing Director": 3,
-        "Healthcare Representative": 4,
-        "Manager": 5,
-        "Sales Representative": 6,
-        "Research Director": 7,
-        "Human Resources": 8,
-        "Senior Engineer": 9,
-        "Software Engineer": 10,
-        "Marketing Manager": 11,
-    },
-    "MaritalStatus": {"Single": 0, "Married": 1, "Divorced": 2},
-    "OverTime": {"No": 0, "Yes": 1},
-}
+# Rows read, scored and flushed per step when streaming batch results
+STREAM_CHUNK_ROWS = int(os.getenv("PREDICT_STREAM_CHUNK_ROWS", "5000"))
 
-# Column name mapping: snake_case (API) -> PascalCase (Model)
-COLUMN_MAPPING = {
-    'age': 'Age',
-    'business_travel': 'BusinessTravel',
-    'daily_rate': 'DailyRate',
-    'department': 'Department',
-    'distance_from_home': 'DistanceFromHome',
-    'education': 'Education',
-    'education_field': 'EducationField',
-    'environment_satisfaction': 'EnvironmentSatisfaction',
-    'gender': 'Gender',
-    'hourly_rate': 'HourlyRate',
-    'job_involvement': 'JobInvolvement',
-    'job_level': 'JobLevel',
-    'job_role': 'JobRole',
-    'job_satisfaction': 'JobSatisfaction',
-    'marital_status': 'MaritalStatus',
-    'monthly_income': 'MonthlyIncome',
-    'monthly_rate': 'MonthlyRate',
-    'num_companies_worked': 'NumCompaniesWorked',
-    'over_time': 'OverTime',
-    'percent_salary_hike': 'PercentSalaryHike',
-    'performance_rating': 'PerformanceRating',
-    'relationship_satisfaction': 'RelationshipSatisfaction',
-    'stock_option_level': 'StockOptionLevel',
-    'total_working_years': 'TotalWorkingYears',
-    'training_times_last_year': 'TrainingTimesLastYear',
-    'work_life_balance': 'WorkLifeBalance',
-    'years_at_company': 'YearsAtCompany',
-    'years_in_current_role': 'YearsInCurrentRole',
-    'years_since_last_promotion': 'YearsSinceLastPromotion',
-    'years_with_curr_manager': 'YearsWithCurrManager',
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
 }
 
-# Expected features in the model (30 features)
-EXPECTED_FEATURES = [
-    'Age', 'BusinessTravel', 'DailyRate', 'Department', 'DistanceFromHome',
-    'Education', 'EducationField', 'EnvironmentSatisfaction', 'Gender',
-    'HourlyRate', 'JobInvolvement', 'JobLevel', 'JobRole', 'JobSatisfaction',
-    'MaritalStatus', 'MonthlyIncome', 'MonthlyRate', 'NumCompaniesWorked',
-    'OverTime', 'PercentSalaryHike', 'PerformanceRating', 'RelationshipSatisfaction',
-    'StockOptionLevel', 'TotalWorkingYears', 'TrainingTimesLastYear',
-    'WorkLifeBalance', 'YearsAtCompany', 'YearsInCurrentRole',
-    'YearsSinceLastPromotion', 'YearsWithCurrManager'
-]
-
-# Load model
-try:
-    model = joblib.load("model/model.pkl")
-    print("✓ Model loaded successfully")
-except Exception as e:
-    print(f"⚠ Warning: Could not load model file: {e}")
-    model = None
+MODEL_PATH = os.getenv("MODEL_PATH", "model/model.pkl")
+
+# The model is loaded at startup (MODEL_PRELOAD) or by the first request
+# that needs it. The scorer, micro-batcher, prediction cache and worker
+# pool are built with it and replaced together by POST /model/reload
+models = ModelHolder(MODEL_PATH)
+
+# Every prediction is queued here and written to the prediction table in batches
+prediction_writer = PredictionWriter() if PREDICTION_LOG_ENABLED else None
 
 
 class EmployeePredictionInput(BaseModel):
+    # Stored with the logged prediction; not a model feature
+    employee_id: Optional[int] = None
+    
     # Required fields (most important for prediction)
     age: int
     department: str = "Research & Development"
@@ -147,86 +95,64 @@ class PredictionResponse(BaseModel):
     prediction: int  # 0 or 1
     probability: float
     riskLevel: str
+    modelVersion: str
 
 
-def prepare_features_for_model(data_dict: dict) -> pd.DataFrame:
-    """
-    Prepare features for model prediction:
-    1. Convert snake_case to PascalCase
-    2. Encode categorical features
-    3. Select only the features the model expects
-    4. Ensure correct order
-    """
-    # Create DataFrame from input
-    df = pd.DataFrame([data_dict])
-    
-    # Rename columns from snake_case to PascalCase
-    df = df.rename(columns=COLUMN_MAPPING)
-    
-    # Encode categorical features using PascalCase names
-    for col, mapping in LABEL_ENCODINGS.items():
-        if col in df.columns:
-            df[col] = df[col].map(mapping).fillna(-1).astype(int)
-    
-    # Select only the features expected by the model (removes extra columns)
-    # Keep only columns that exist in both df and EXPECTED_FEATURES
-    available_features = [col for col in EXPECTED_FEATURES if col in df.columns]
-    df_model = df[available_features]
-    
-    # Ensure all expected features are present (add missing with 0)
-    for feature in EXPECTED_FEATURES:
-        if feature not in df_model.columns:
-            df_model[feature] = 0
-    
-    # Reorder columns to match model expectations
-    df_model = df_model[EXPECTED_FEATURES]
-    
-    return df_model
+async def acquire_model() -> Optional[ModelState]:
+    """models.acquire(), with a first-time model load kept off the event loop"""
+    if models.current is None:
+        await run_in_threadpool(models.get)
+    return models.acquire()
 
 
 @router.post("/single", response_model=PredictionResponse)
-def predict_single(
-    data: EmployeePredictionInput,
-    session: Session = Depends(get_session)
-):
+async def predict_single(data: EmployeePredictionInput):
     """Predict attrition for a single employee"""
-    if model is None:
+    state = await acquire_model()
+    if state is None:
         raise HTTPException(
             status_code=503,
             detail="Model not available. Please train the model first."
         )
-    
     try:
-        # Convert to dict (snake_case from API)
-        input_dict = data.dict()
-        
-        print(f"📥 Received data keys: {list(input_dict.keys())}")
+        return await score_single(state, data)
+    finally:
+        models.release(state)
+
+
+async def score_single(state: ModelState, data: EmployeePredictionInput) -> dict:
+    try:
+        # Encode straight into the model's feature order. Each request gets
+        # its own row because scoring happens off the event loop thread.
+        row = feature_encoder.encode(data, feature_encoder.new_row())
         
-        # Prepare features for model (convert to PascalCase and encode)
-        df_model = prepare_features_for_model(input_dict)
+        cache = state.cache
+        cache_key = cache.key(row) if cache else None
+        cached = cache.get(cache_key) if cache else None
         
-        print(f"🔢 Model input shape: {df_model.shape}")
-        print(f"📊 Model input columns: {df_model.columns.tolist()}")
-        print(f"📋 Sample values: {df_model.iloc[0].to_dict()}")
+        # One predict_proba pass gives the label, probability and risk level
+        if cached is not None:
+            prediction, probability, risk_level = cached
+        elif state.batcher is not None:
+            prediction, probability, risk_level = await state.batcher.submit(row)
+        else:
+            prediction, probability, risk_level = await run_in_threadpool(state.scorer.score_one, row)
         
-        # Make prediction
-        prediction = int(model.predict(df_model)[0])
-        probability = float(model.predict_proba(df_model)[0][1])
+        if cache and cached is None:
+            cache.set(cache_key, (prediction, probability, risk_level))
         
-        # Determine risk level
-        if probability < 0.3:
-            risk_level = "Low"
-        elif probability < 0.7:
-            risk_level = "Medium"
-        else:
-            risk_level = "High"
+        if prediction_writer:
+            prediction_writer.record(prediction_rows(
+                [prediction], [probability], [risk_level], state.version, [data.employee_id]
+            ))
         
         print(f"✓ Prediction: {prediction}, Probability: {probability:.4f}, Risk: {risk_level}")
         
         return {
             "prediction": prediction,
             "probability": round(probability, 4),
-            "riskLevel": risk_level
+            "riskLevel": risk_level,
+            "modelVersion": state.version
         }
     
     except Exception as e:
@@ -238,62 +164,162 @@ def predict_single(
         )
 
 
+def score_chunk(df: "pd.DataFrame", state: Optional[ModelState] = None) -> "pd.DataFrame":
+    """
+    Append prediction, probability and riskLevel columns to a chunk of rows
+    and queue the results for the prediction log. An employee_id column, if
+    present, is stored with each logged prediction.
+    
+    Scores with `state`, or with whichever model is current when no state
+    is given (background jobs).
+    """
+    import pandas as pd
+
+    if state is None:
+        with models.lease() as current:
+            if current is None:
+                raise RuntimeError("Model not available. Please train the model first.")
+            return score_chunk(df, current)
+    
+    features = encode_frame(df)
+    predictions, probabilities, risk = state.scorer.score(features)
+    df['prediction'] = predictions
+    df['probability'] = probabilities
+    df['riskLevel'] = risk
+    if prediction_writer:
+        employee_ids = None
+        if 'employee_id' in df:
+            ids = pd.to_numeric(df['employee_id'], errors='coerce').astype('Int64')
+            employee_ids = ids.astype(object).where(ids.notna(), None).tolist()
+        prediction_writer.record(prediction_rows(
+            predictions, probabilities, risk, state.version, employee_ids
+        ))
+    return df
+
+
+def open_stream(source: BinaryIO, state: ModelState):
+    """
+    Start reading an upload for streaming and score its first chunk, so a
+    file that cannot be parsed or scored is rejected before any output is
+    sent. Returns (first scored chunk or None for an empty file, reader).
+    """
+    import pandas as pd
+
+    reader = pd.read_csv(source, chunksize=STREAM_CHUNK_ROWS)
+    first = next(reader, None)
+    return (score_chunk(first, state) if first is not None else None), reader
+
+
+def stream_predictions(first, reader, output_format: str, state: ModelState) -> Iterator[str]:
+    """
+    Yield the already scored first chunk, then read the rest of the upload
+    STREAM_CHUNK_ROWS rows at a time and yield each scored chunk as NDJSON
+    lines or CSV text, so memory stays flat whatever the file size. Every
+    chunk is scored by `state`, the model acquired for the request, which
+    is released when the stream ends.
+
+    A failure after the first chunk ends the stream with an error record:
+    an {"error": ..., "processed": N} line for NDJSON, or a final
+    "#error,..." line for CSV.
+    """
+    total = 0
+    try:
+        chunks = [] if first is None else [first]
+        for i, chunk in enumerate(itertools.chain(chunks, reader)):
+            if i > 0:
+                chunk = score_chunk(chunk, state)
+            total += len(chunk)
+            if output_format == "ndjson":
+                lines = chunk.to_json(orient="records", lines=True)
+                yield lines if lines.endswith("\n") else lines + "\n"
+            else:
+                yield chunk.to_csv(index=False, header=(i == 0))
+        print(f"✓ Streamed batch prediction complete: {total} employees")
+    except Exception as e:
+        # Headers are already sent, so report the failure in-band
+        print(f"❌ Streamed batch prediction error after {total} rows: {str(e)}")
+        print(traceback.format_exc())
+        message = f"Batch prediction failed: {str(e)}"
+        if output_format == "ndjson":
+            yield json.dumps({"error": message, "processed": total}) + "\n"
+        else:
+            # Skipped by CSV readers that treat '#' as a comment (pandas: comment="#")
+            yield "#error," + json.dumps(message) + f",processed={total}\n"
+    finally:
+        models.release(state)
+
+
+# Background worker for /jobs uploads; started with the app
+job_runner = JobRunner(score_chunk)
+
+
+def score_upload(source: BinaryIO, state: ModelState) -> List[dict]:
+    """Read a whole CSV upload and return one scored record per row"""
+    import pandas as pd
+
+    df = pd.read_csv(source)
+    
+    print(f"📥 Batch upload: {len(df)} rows, columns: {df.columns.tolist()}")
+    
+    # Encode the whole frame at once and score it chunk by chunk
+    return score_chunk(df, state).to_dict('records')
+
+
 @router.post("/batch")
 async def predict_batch(
     file: UploadFile = File(...),
-    session: Session = Depends(get_session)
+    format: str = Query("json", pattern="^(json|ndjson|csv)$")
 ):
-    """Predict attrition for multiple employees from CSV file"""
-    if model is None:
+    """
+    Predict attrition for multiple employees from CSV file.
+
+    format=json (default) returns every row in one JSON document;
+    format=ndjson or format=csv stream results back chunk by chunk.
+    Every row is scored by the same model, named in modelVersion (JSON) or
+    the X-Model-Version header (streams).
+    """
+    if not file.filename or not file.filename.endswith('.csv'):
+        raise HTTPException(
+            status_code=400,
+            detail="Only CSV files are accepted"
+        )
+    
+    state = await acquire_model()
+    if state is None:
         raise HTTPException(
             status_code=503,
             detail="Model not available. Please train the model first."
         )
     
-    if not file.filename or not file.filename.endswith('.csv'):
-        raise HTTPException(
-            status_code=400,
-            detail="Only CSV files are accepted"
+    if format in STREAM_MEDIA_TYPES:
+        # The upload is spooled to a temp file; read it straight from there.
+        # The first chunk is parsed and scored up front so bad input gets a
+        # 400 instead of a truncated 200. Starlette iterates the generator in
+        # the threadpool, and the generator releases the model when it finishes
+        try:
+            first, reader = await run_in_threadpool(open_stream, file.file, state)
+        except Exception as e:
+            models.release(state)
+            print(f"❌ Batch prediction rejected: {str(e)}")
+            raise HTTPException(
+                status_code=400,
+                detail=f"Batch prediction failed: {str(e)}"
+            )
+        return StreamingResponse(
+            stream_predictions(first, reader, format, state),
+            media_type=STREAM_MEDIA_TYPES[format],
+            headers={"X-Model-Version": state.version},
         )
     
     try:
-        # Read CSV file
-        contents = await file.read()
-        df = pd.read_csv(io.StringIO(contents.decode('utf-8')))
-        
-        print(f"📥 Batch upload: {len(df)} rows, columns: {df.columns.tolist()}")
-        
-        # Store original data
-        original_df = df.copy()
-        
-        # Process each row
-        predictions_list = []
-        probabilities_list = []
-        
-        for idx, row in df.iterrows():
-            row_dict = row.to_dict()
-            df_model = prepare_features_for_model(row_dict)
-            
-            pred = int(model.predict(df_model)[0])
-            prob = float(model.predict_proba(df_model)[0][1])
-            
-            predictions_list.append(pred)
-            probabilities_list.append(prob)
-        
-        # Add results to original dataframe
-        original_df['prediction'] = predictions_list
-        original_df['probability'] = probabilities_list
-        original_df['riskLevel'] = original_df['probability'].apply(
-            lambda x: 'Low' if x < 0.3 else ('Medium' if x < 0.7 else 'High')
-        )
-        
-        # Convert to list of dicts
-        results = original_df.to_dict('records')
+        # Parsing and scoring are CPU-bound; keep them off the event loop
+        results = await run_in_threadpool(score_upload, file.file, state)
         
         print(f"✓ Batch prediction complete: {len(results)} employees")
         
         return {
             "total": len(results),
+            "modelVersion": state.version,
             "predictions": results
         }
     
@@ -304,23 +330,122 @@ async def predict_batch(
             status_code=500,
             detail=f"Batch prediction failed: {str(e)}"
         )
+    finally:
+        models.release(state)
 
 
-@router.get("/history")
-def get_prediction_history(
-    limit: int = 50,
+@router.post("/jobs", status_code=202)
+def submit_prediction_job(
+    file: UploadFile = File(...),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
     session: Session = Depends(get_session)
 ):
-    """Get prediction history"""
-    from sqlmodel import select
+    """
+    Queue a CSV file for background scoring and return its job id at once.
+
+    Poll GET /jobs/{id} for progress and download the scored rows from
+    GET /jobs/{id}/result when the job has completed.
+    """
+    if models.get() is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Model not available. Please train the model first."
+        )
     
-    try:
-        predictions = session.exec(
-            select(Prediction).order_by(Prediction.id.desc()).limit(limit)
-        ).all()
-        return predictions
-    except Exception as e:
-        return []
+    if not file.filename or not file.filename.endswith('.csv'):
+        raise HTTPException(
+            status_code=400,
+            detail="Only CSV files are accepted"
+        )
+    
+    job = create_job(session, file.file, file.filename, format)
+    job_runner.notify()
+    print(f"📥 Queued prediction job {job.id} ({file.filename})")
+    return job_status(job)
+
+
+@router.get("/jobs/{job_id}")
+def get_prediction_job(job_id: str, session: Session = Depends(get_session)):
+    """Get the status and progress of a batch prediction job"""
+    job = session.get(PredictionJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_status(job)
+
+
+@router.get("/jobs/{job_id}/result")
+def get_prediction_job_result(job_id: str, session: Session = Depends(get_session)):
+    """Download the scored rows of a completed job"""
+    job = session.get(PredictionJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != "completed":
+        raise HTTPException(
+            status_code=409,
+            detail=f"Job is {job.status}; results are available once it has completed"
+        )
+    stem = os.path.splitext(job.filename or "predictions")[0]
+    return FileResponse(
+        job.output_path,
+        media_type=STREAM_MEDIA_TYPES[job.output_format],
+        filename=f"{stem}-predictions.{job.output_format}",
+    )
+
+
+@router.get("/history", response_model=List[Prediction])
+def get_prediction_history(
+    *,
+    session: Session = Depends(get_session),
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    start: Optional[datetime] = Query(None, description="Only predictions made at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only predictions made before this time"),
+    employee_id: Optional[int] = None
+):
+    """
+    Get prediction history, newest first.
+    
+    Pages are keyed on (created_at, id): when more rows exist the
+    X-Next-Cursor response header holds the value to pass as `cursor` for
+    the next page.
+    """
+    query = select(Prediction)
+    if start is not None:
+        query = query.where(Prediction.created_at >= start)
+    if end is not None:
+        query = query.where(Prediction.created_at < end)
+    if employee_id is not None:
+        query = query.where(Prediction.employee_id == employee_id)
+    
+    if cursor:
+        try:
+            cursor_time, cursor_id = cursor.rsplit("_", 1)
+            position = (datetime.fromisoformat(cursor_time), int(cursor_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(tuple_(Prediction.created_at, Prediction.id) < tuple_(*position))
+    
+    # Fetch one extra row to know whether there is a next page
+    query = query.order_by(Prediction.created_at.desc(), Prediction.id.desc()).limit(limit + 1)
+    predictions = session.exec(query).all()
+    
+    if len(predictions) > limit:
+        predictions = predictions[:limit]
+        last = predictions[-1]
+        response.headers["X-Next-Cursor"] = f"{last.created_at.isoformat()}_{last.id}"
+    return predictions
+
+
+@router.get("/rollup")
+def get_prediction_rollup(
+    granularity: str = Query("day", pattern="^(day|week)$"),
+    start: Optional[date] = Query(None, description="First day to include"),
+    end: Optional[date] = Query(None, description="Day after the last one to include"),
+    session: Session = Depends(get_session)
+):
+    """Get prediction counts per day or week and risk level"""
+    return read_rollup(session, granularity, start, end)
 
 
 @router.get("/encodings")
@@ -332,8 +457,66 @@ def get_encodings():
 @router.get("/features")
 def get_expected_features():
     """Get list of features expected by the model"""
+    state = models.current
     return {
         "features": EXPECTED_FEATURES,
         "count": len(EXPECTED_FEATURES),
-        "column_mapping": COLUMN_MAPPING
-    }
\ No newline at end of file
+        "column_mapping": COLUMN_MAPPING,
+        "threshold": state.scorer.threshold if state else DECISION_THRESHOLD
+    }
+
+
+@router.get("/stats")
+def get_prediction_stats():
+    """Get runtime counters for the prediction path (micro-batch sizes, cache hits)"""
+    state = models.current
+    return {
+        "model": models.stats(),
+        "microbatch": state.batcher.stats() if state and state.batcher else {"enabled": False},
+        "cache": state.cache.stats() if state and state.cache else {"enabled": False},
+        "pool": state.pool.stats() if state and state.pool else {"enabled": False},
+        "log": prediction_writer.stats() if prediction_writer else {"enabled": False}
+    }
+
+
+@router.get("/model")
+def get_model_info(session: Session = Depends(get_session)):
+    """Get the loaded model, its decision threshold, risk bands and registry entry"""
+    state = models.get()
+    if state is None:
+        return {"loaded": False, "error": models.last_error}
+    return {
+        "loaded": True,
+        "featureCount": len(EXPECTED_FEATURES),
+        **state.info(),
+        "registry": find_model(session, state.version)
+    }
+
+
+@router.post("/model/reload")
+async def reload_model(force: bool = Query(False, description="Reload even if the file is unchanged")):
+    """
+    Load the model file again and swap it in. Requests already running
+    finish on the model they started with; if the new file cannot be
+    loaded the current model keeps serving.
+    """
+    try:
+        result = await run_in_threadpool(models.reload, force)
+    except Exception as e:
+        print(f"❌ Model reload failed: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail=f"Model reload failed: {str(e)}"
+        )
+    if result["reloaded"]:
+        print(f"🔄 Model reloaded: {result['previousVersion']} → {result['modelVersion']}")
+    return result
+
+
+@router.get("/models", response_model=List[Model])
+def list_models(
+    limit: int = Query(20, ge=1, le=200),
+    session: Session = Depends(get_session)
+):
+    """Get registered training runs, newest first"""
+    return session.exec(select(Model).order_by(Model.id.desc()).limit(limit)).all()
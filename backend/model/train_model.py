@@ -35,7 +35,16 @@ def train_model():
     conf_matrix = confusion_matrix(y_test, y_pred)
 
     # === 4️⃣ Save Model + Encoders ===
-    joblib.dump(model, os.path.join(MODEL_PATH, "model.pkl"))
+    # Written to temporary files and renamed into place, so a running API
+    # watching model.pkl never loads a half-written file. The Booster is
+    # written second so it is at least as new as the pickle.
+    model_file = os.path.join(MODEL_PATH, "model.pkl")
+    booster_file = os.path.join(MODEL_PATH, "model.ubj")
+    joblib.dump(model, model_file + ".tmp")
+    # Raw Booster for the API's "booster" inference backend (no sklearn/pickle needed)
+    model.get_booster().save_model(booster_file + ".tmp.ubj")
+    os.replace(model_file + ".tmp", model_file)
+    os.replace(booster_file + ".tmp.ubj", booster_file)
     joblib.dump(encoders, os.path.join(MODEL_PATH, "encoder.pkl"))
 
     # === 5️⃣ Save Metrics ===
@@ -62,11 +71,35 @@ def train_model():
     print(f"🔁 Recall:        {recall:.3f} → How many actual leavers it caught")
     print(f"⚖️  F1-Score:      {f1:.3f} → Overall performance balance")
     print(f"🧠 Model Type:    XGBoostClassifier")
-    print(f"📁 Saved Model:   {os.path.join(MODEL_PATH, 'model.pkl')}")
+    print(f"🏷️  Version:       {register_run(model_file, accuracy, precision, recall, f1, len(X_train))}")
+    print(f"📁 Saved Model:   {os.path.join(MODEL_PATH, 'model.pkl')} (+ model.ubj)")
     print(f"📊 Metrics File:  {os.path.join(OUTPUT_PATH, 'metrics.json')}")
     print(f"📉 Confusion Mat: {os.path.join(OUTPUT_PATH, 'confusion_matrix.png')}")
     print("────────────────────────────────────────")
     print("✅ Model training completed successfully.\n")
 
+def register_run(model_file, accuracy, precision, recall, f1, training_data_size):
+    """Record this run in the API's model registry; returns the model version"""
+    from app.db.engine import engine, create_db_and_tables
+    from app.ml.registry import register_model
+    from sqlmodel import Session
+
+    try:
+        create_db_and_tables()
+        with Session(engine) as session:
+            entry = register_model(
+                session,
+                model_file,
+                accuracy=accuracy,
+                precision=precision,
+                recall=recall,
+                f1=f1,
+                training_data_size=training_data_size,
+            )
+            return entry.version
+    except Exception as e:
+        print(f"⚠ Could not record the run in the model registry: {e}")
+        return None
+
 if __name__ == "__main__":
     train_model()
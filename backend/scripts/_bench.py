@@ -0,0 +1,121 @@
+"""
+Shared helpers for the benchmark scripts in this folder.
+Run the benchmarks from the backend/ directory, like seed.py.
+"""
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from app.ml.features import COLUMN_MAPPING, EXPECTED_FEATURES, LABEL_ENCODINGS
+
+MODEL_FILE = "model/model.pkl"
+
+# Plausible value ranges for the numeric columns of a synthetic employee
+NUMERIC_RANGES = {
+    "age": (18, 60),
+    "daily_rate": (100, 1500),
+    "distance_from_home": (1, 30),
+    "education": (1, 5),
+    "environment_satisfaction": (1, 4),
+    "hourly_rate": (30, 100),
+    "job_involvement": (1, 4),
+    "job_level": (1, 5),
+    "job_satisfaction": (1, 4),
+    "monthly_income": (1000, 150000),
+    "monthly_rate": (2000, 27000),
+    "num_companies_worked": (0, 9),
+    "percent_salary_hike": (11, 25),
+    "performance_rating": (3, 4),
+    "relationship_satisfaction": (1, 4),
+    "stock_option_level": (0, 3),
+    "total_working_years": (0, 40),
+    "training_times_last_year": (0, 6),
+    "work_life_balance": (1, 4),
+    "years_at_company": (0, 40),
+    "years_in_current_role": (0, 18),
+    "years_since_last_promotion": (0, 15),
+    "years_with_curr_manager": (0, 17),
+}
+
+
+def synthetic_employees(n: int, seed: int = 42) -> pd.DataFrame:
+    """Random employees with the snake_case columns the API accepts"""
+    rng = np.random.default_rng(seed)
+    pascal_to_snake = {v: k for k, v in COLUMN_MAPPING.items()}
+    data = {}
+    for column, (low, high) in NUMERIC_RANGES.items():
+        data[column] = rng.integers(low, high + 1, n)
+    for pascal, mapping in LABEL_ENCODINGS.items():
+        data[pascal_to_snake[pascal]] = rng.choice(list(mapping), n)
+    data["attrition"] = rng.choice(["Yes", "No"], n, p=[0.16, 0.84])
+    return pd.DataFrame(data)
+
+
+def load_model():
+    """Load the trained model, or fit a throwaway one on synthetic data"""
+    if os.path.exists(MODEL_FILE):
+        return joblib.load(MODEL_FILE)
+
+    from xgboost import XGBClassifier
+    from app.ml.features import encode_frame
+
+    print(f"⚠ {MODEL_FILE} not found, training a synthetic model for the benchmark")
+    df = synthetic_employees(2000, seed=7)
+    X = pd.DataFrame(encode_frame(df), columns=EXPECTED_FEATURES)
+    y = (df["attrition"] == "Yes").astype(int)
+    return XGBClassifier(eval_metric="logloss", random_state=42).fit(X, y)
+
+
+def timed(fn, *args, **kwargs):
+    """Run fn once and return (result, elapsed seconds)"""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def percentiles(samples, *points):
+    """Percentiles of a list of durations in seconds, returned in milliseconds"""
+    values = np.percentile(np.asarray(samples) * 1000, points)
+    return [round(float(v), 3) for v in values]
+
+
+def bench_engine(url: str = None, tuned: bool = True):
+    """
+    Engine for a benchmark database; a fresh temp SQLite file by default.
+    tuned=False skips make_engine() (pool settings and SQLite pragmas) and
+    uses a plain create_engine() as the app did before.
+    """
+    import tempfile
+    from sqlmodel import SQLModel, create_engine
+    from app.db.engine import create_db_and_tables, make_engine  # noqa: F401  (registers models)
+    from app.models.employee import Employee  # noqa: F401
+    from app.models.prediction import Prediction  # noqa: F401
+    from app.models.analytics_summary import AnalyticsSummary  # noqa: F401
+
+    if url is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="hr-bench-"), "bench.db")
+        url = f"sqlite:///{path}"
+    if tuned:
+        engine = make_engine(url)
+    else:
+        connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+        engine = create_engine(url, connect_args=connect_args)
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def seed_employees(engine, n: int, batch_size: int = 10000, seed: int = 42):
+    """Insert n synthetic employees with executemany batches"""
+    from sqlmodel import Session, insert
+    from app.models.employee import Employee
+
+    df = synthetic_employees(n, seed)
+    df["employee_number"] = np.arange(1, n + 1)
+    records = df.to_dict("records")
+    with Session(engine) as session:
+        for start in range(0, n, batch_size):
+            session.execute(insert(Employee), records[start:start + batch_size])
+        session.commit()
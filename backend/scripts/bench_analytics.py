@@ -0,0 +1,97 @@
+from _fix_path import *
+
+# scripts/bench_analytics.py
+# Seed N synthetic employees and compare the DB time of the analytics
+# endpoints before and after their query rewrites (breakdowns now read the
+# materialized snapshot). The "after" side runs the queries behind the now
+# async handlers directly on a sync Session.
+# Usage: python scripts/bench_analytics.py [rows] [database_url]
+import sys
+import time
+
+from sqlmodel import Session, select, func
+
+from _bench import bench_engine, seed_employees
+from app.models.employee import Employee
+from app.analytics.queries import SALARY_RANGES, dashboard_statement
+from app.analytics.summary import read_summary, rebuild_summary
+
+
+def legacy_dashboard(session):
+    """The five round trips get_dashboard_stats used to make"""
+    session.exec(select(func.count(Employee.id))).one()
+    session.exec(select(func.count(Employee.id)).where(Employee.attrition == "Yes")).one()
+    session.exec(select(func.avg(Employee.age))).one()
+    session.exec(select(func.avg(Employee.monthly_income))).one()
+    session.exec(select(func.avg(Employee.job_satisfaction))).one()
+
+
+def legacy_breakdown(session, key):
+    """Load every Employee and count per group in Python, as the old handlers did"""
+    stats = {}
+    for emp in session.exec(select(Employee)).all():
+        group = key(emp)
+        if group is None:
+            continue
+        total, attrition = stats.get(group, (0, 0))
+        stats[group] = (total + 1, attrition + (emp.attrition == "Yes"))
+    return stats
+
+
+def legacy_salary_label(emp):
+    salary = emp.monthly_income or 0
+    for min_sal, max_sal, label in SALARY_RANGES:
+        if min_sal <= salary and (max_sal is None or salary < max_sal):
+            return label
+    return None
+
+
+# name -> (before, after), each a callable taking a Session
+CASES = {
+    "dashboard": (legacy_dashboard, lambda s: s.exec(dashboard_statement()).one()),
+    "department": (
+        lambda s: legacy_breakdown(s, lambda e: e.department or "Unknown"),
+        lambda s: read_summary(s, "department"),
+    ),
+    "role": (
+        lambda s: legacy_breakdown(s, lambda e: e.job_role or "Unknown"),
+        lambda s: read_summary(s, "job_role"),
+    ),
+    "salary": (
+        lambda s: legacy_breakdown(s, legacy_salary_label),
+        lambda s: read_summary(s, "salary_range"),
+    ),
+}
+
+
+def best_of(fn, session, runs):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(session)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    url = sys.argv[2] if len(sys.argv) > 2 else None
+    runs = 5
+
+    engine = bench_engine(url)
+    print(f"Seeding {rows} employees into {engine.url} ...")
+    seed_employees(engine, rows)
+    with Session(engine) as session:
+        rebuild_summary(session)
+
+    print(f"{'endpoint':<12} {'before ms':>12} {'after ms':>12} {'speed-up':>10}")
+    with Session(engine) as session:
+        for name, (before, after) in CASES.items():
+            session.expunge_all()
+            before_ms = best_of(before, session, runs)
+            after_ms = best_of(after, session, runs)
+            print(f"{name:<12} {before_ms:>12.2f} {after_ms:>12.2f} {before_ms / after_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
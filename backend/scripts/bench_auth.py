@@ -0,0 +1,67 @@
+from _fix_path import *
+
+# scripts/bench_auth.py
+# Authenticated request throughput: GET /api/auth/me from concurrent
+# clients against a temp database, with the token -> user cache disabled
+# (a user lookup per request) and enabled.
+# Usage: python scripts/bench_auth.py [seconds] [concurrency]
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='hr-bench-'), 'bench.db')}",
+)
+
+import httpx
+
+from app.main import app, create_db_and_tables
+from app.routes import auth
+
+
+async def hammer(client, headers, stop_at, counts):
+    while time.perf_counter() < stop_at:
+        response = await client.get("/api/auth/me", headers=headers)
+        response.raise_for_status()
+        counts[0] += 1
+
+
+async def run(seconds, concurrency, token):
+    """requests/sec without and with the cache, on one event loop (the async pool is bound to it)"""
+    headers = {"Authorization": f"Bearer {token}"}
+    transport = httpx.ASGITransport(app=app)
+    rates = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for label, size in (("no cache", 0), ("cache   ", auth.AUTH_CACHE_SIZE)):
+            auth.principal_cache.max_size = size
+            auth.principal_cache.clear()
+            counts = [0]
+            stop_at = time.perf_counter() + seconds
+            await asyncio.gather(*(hammer(client, headers, stop_at, counts) for _ in range(concurrency)))
+            rates[label] = counts[0] / seconds
+    return rates
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    create_db_and_tables()
+    from fastapi.testclient import TestClient
+    with TestClient(app) as client:
+        response = client.post("/api/auth/register", json={
+            "name": "Bench", "email": f"bench-{os.getpid()}@example.com", "password": "bench-password",
+        })
+        token = response.json()["token"]
+
+    print(f"GET /api/auth/me, {concurrency} concurrent clients, {seconds:.0f}s each")
+    for label, rate in asyncio.run(run(seconds, concurrency, token)).items():
+        print(f"{label}: {rate:10,.0f} requests/sec")
+    print(f"cache stats: {auth.principal_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+from _fix_path import *
+
+# scripts/bench_backends.py
+# Single-row p50/p99 latency and batch rows/sec for each inference backend
+# (sklearn, booster, treelite, onnx), plus the largest probability
+# difference from the sklearn path. Backends whose optional packages are
+# missing are skipped. The first treelite/onnx run includes the compile.
+# Usage: python scripts/bench_backends.py [batch_rows] [iterations]
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+
+from _bench import MODEL_FILE, synthetic_employees, load_model, timed, percentiles
+from app.ml.backends import load_backend
+from app.ml.features import encode_frame
+
+BACKENDS = ("sklearn", "booster", "treelite", "onnx")
+
+
+def single_row_latency(backend, row, iterations):
+    backend.predict_proba(row)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        backend.predict_proba(row)
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples, 50, 99)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    model_path = MODEL_FILE
+    if not os.path.exists(model_path):
+        model_path = os.path.join(tempfile.mkdtemp(prefix="hr-bench-"), "model.pkl")
+        joblib.dump(load_model(), model_path)
+
+    matrix = encode_frame(synthetic_employees(rows))
+    row = matrix[:1].copy()
+    reference = None
+
+    print(f"{rows} batch rows, {iterations} single-row calls")
+    for name in BACKENDS:
+        try:
+            backend, load_time = timed(load_backend, name, model_path)
+        except ImportError as e:
+            print(f"{name:<9}: skipped ({e})")
+            continue
+        p50, p99 = single_row_latency(backend, row, iterations)
+        probabilities, batch_time = timed(backend.predict_proba, matrix)
+        if reference is None:
+            reference = probabilities
+        diff = float(np.abs(probabilities - reference).max())
+        print(
+            f"{name:<9}: single p50 {p50:7.3f} ms  p99 {p99:7.3f} ms  "
+            f"batch {rows / batch_time:12,.0f} rows/sec  load {load_time:6.2f}s  max diff {diff:.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+from _fix_path import *
+
+# scripts/bench_bulk_import.py
+# Compare loading N employees one ORM object at a time (the old seed.py
+# approach) with the bulk upsert path, then time a full re-import (updates).
+# Usage: python scripts/bench_bulk_import.py [rows] [database_url]
+import sys
+
+from sqlmodel import Session
+
+from _bench import bench_engine, synthetic_employees, timed
+from app.models.employee import Employee
+from app.db.bulk import normalize_columns, upsert_employees
+from app.db.search import ensure_search_index
+
+
+def orm_row_by_row(engine, df):
+    with Session(engine) as s:
+        for _, row in df.iterrows():
+            s.add(Employee(**row.to_dict()))
+        s.commit()
+
+
+def bulk_upsert(engine, df):
+    with Session(engine) as s:
+        ensure_search_index(s)
+        return upsert_employees(s, df)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    url = sys.argv[2] if len(sys.argv) > 2 else None
+
+    df = synthetic_employees(rows)
+    df["employee_number"] = range(1, rows + 1)
+    df = normalize_columns(df)
+
+    # A sample keeps the slow path bearable; rows/sec is what we compare
+    sample = min(rows, 10000)
+    _, orm_time = timed(orm_row_by_row, bench_engine(url), df.head(sample))
+
+    engine = bench_engine(url)
+    result, insert_time = timed(bulk_upsert, engine, df)
+    result_again, update_time = timed(bulk_upsert, engine, df)
+
+    print(f"ORM row by row : {sample:>8} rows in {orm_time:7.2f}s → {sample / orm_time:10,.0f} rows/sec")
+    print(f"bulk insert    : {rows:>8} rows in {insert_time:7.2f}s → {rows / insert_time:10,.0f} rows/sec ({result['inserted']} inserted)")
+    print(f"bulk re-import : {rows:>8} rows in {update_time:7.2f}s → {rows / update_time:10,.0f} rows/sec ({result_again['updated']} updated)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+from _fix_path import *
+
+# scripts/bench_db_concurrency.py
+# Concurrent read/write load test: reader threads run the dashboard
+# aggregate and id lookups while writer threads update employees, first on
+# a plain engine (rollback journal, default pool) and then on make_engine()
+# (WAL, synchronous=NORMAL, mmap, larger cache, tuned pool).
+# Usage: python scripts/bench_db_concurrency.py [rows] [seconds] [readers] [writers] [database_url]
+import random
+import sys
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, select, update
+
+from _bench import bench_engine, seed_employees
+from app.models.employee import Employee
+from app.analytics.queries import dashboard_statement
+
+
+def reader(engine, rows, stop, counts):
+    rng = random.Random()
+    while not stop.is_set():
+        try:
+            with Session(engine) as session:
+                session.exec(dashboard_statement()).one()
+                session.exec(select(Employee).where(Employee.id == rng.randint(1, rows))).first()
+            counts["reads"] += 1
+        except OperationalError:
+            counts["errors"] += 1
+
+
+def writer(engine, rows, stop, counts):
+    rng = random.Random()
+    while not stop.is_set():
+        try:
+            with Session(engine) as session:
+                session.exec(
+                    update(Employee)
+                    .where(Employee.id == rng.randint(1, rows))
+                    .values(monthly_income=rng.randint(1000, 20000))
+                )
+                session.commit()
+            counts["writes"] += 1
+        except OperationalError:
+            counts["errors"] += 1
+
+
+def run(engine, rows, seconds, readers, writers):
+    stop = threading.Event()
+    counts = [{"reads": 0, "writes": 0, "errors": 0} for _ in range(readers + writers)]
+    threads = [
+        threading.Thread(target=reader, args=(engine, rows, stop, counts[i]))
+        for i in range(readers)
+    ] + [
+        threading.Thread(target=writer, args=(engine, rows, stop, counts[readers + i]))
+        for i in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return {key: sum(c[key] for c in counts) for key in ("reads", "writes", "errors")}
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    readers = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    writers = int(sys.argv[4]) if len(sys.argv) > 4 else 2
+    url = sys.argv[5] if len(sys.argv) > 5 else None
+
+    print(f"{rows} employees, {readers} readers + {writers} writers for {seconds:.0f}s each")
+    for label, tuned in (("plain engine", False), ("make_engine ", True)):
+        engine = bench_engine(url, tuned=tuned)
+        seed_employees(engine, rows)
+        result = run(engine, rows, seconds, readers, writers)
+        engine.dispose()
+        print(
+            f"{label}: {result['reads'] / seconds:8,.0f} reads/sec  "
+            f"{result['writes'] / seconds:8,.0f} writes/sec  {result['errors']} errors"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+from _fix_path import *
+
+# scripts/bench_pool_predict.py
+# Score one large encoded matrix inline and then through the process pool
+# with 1, 2, 4 ... workers (up to the core count) to show how batch scoring
+# scales across cores. Then scores the same rows in chunks the size of a
+# streamed upload or background job step (PREDICT_STREAM_CHUNK_ROWS), one
+# chunk after another, inline and through each pool. Pool start-up
+# (spawn + model load) is timed apart.
+# Usage: python scripts/bench_pool_predict.py [rows] [shard_size] [max_workers] [chunk_rows]
+import os
+import sys
+import tempfile
+
+import joblib
+import numpy as np
+
+from _bench import MODEL_FILE, synthetic_employees, load_model, timed
+from app.ml.features import encode_frame
+from app.ml.pool import InferencePool
+from app.ml.scoring import AttritionScorer
+from app.routes.predict import STREAM_CHUNK_ROWS
+
+
+def worker_counts(limit):
+    counts, n = [], 1
+    while n < limit:
+        counts.append(n)
+        n *= 2
+    return counts + [limit]
+
+
+def score_chunks(predict_proba, matrix, chunk_rows):
+    return np.concatenate([
+        predict_proba(matrix[start:start + chunk_rows])
+        for start in range(0, len(matrix), chunk_rows)
+    ])
+
+
+def report(label, rows, elapsed, baseline, extra=""):
+    print(
+        f"{label:<11}: {elapsed:7.2f}s → {rows / elapsed:12,.0f} rows/sec "
+        f"({baseline / elapsed:.2f}x inline{extra})"
+    )
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    shard_size = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1)
+    chunk_rows = int(sys.argv[4]) if len(sys.argv) > 4 else STREAM_CHUNK_ROWS
+
+    model = load_model()
+    model_path = MODEL_FILE
+    if not os.path.exists(model_path):
+        # Workers load the model from disk, so save the synthetic one
+        model_path = os.path.join(tempfile.mkdtemp(prefix="hr-bench-"), "model.pkl")
+        joblib.dump(model, model_path)
+
+    matrix = encode_frame(synthetic_employees(rows))
+    scorer = AttritionScorer(model)
+    inline, inline_time = timed(scorer.predict_proba, matrix)
+    _, chunked_time = timed(score_chunks, scorer.predict_proba, matrix, chunk_rows)
+
+    results = []
+    for workers in worker_counts(max_workers):
+        pool = InferencePool(model_path, workers, shard_size, min_rows=1)
+        _, start_time = timed(pool.start)
+        probabilities, pool_time = timed(pool.predict_proba, matrix)
+        chunked, pool_chunked_time = timed(score_chunks, pool.predict_proba, matrix, chunk_rows)
+        pool.close()
+        same = np.allclose(probabilities, inline) and np.allclose(chunked, inline)
+        results.append((workers, start_time, pool_time, pool_chunked_time, same))
+
+    print(f"{rows} rows, shard size {shard_size}, {os.cpu_count()} cores")
+    print("Whole matrix")
+    report("inline", rows, inline_time, inline_time)
+    for workers, start_time, pool_time, _, same in results:
+        report(
+            f"{workers:>2} workers", rows, pool_time, inline_time,
+            f", start-up {start_time:.2f}s, matches inline: {same}",
+        )
+    print(f"{chunk_rows}-row chunks (streaming / jobs)")
+    report("inline", rows, chunked_time, chunked_time)
+    for workers, _, _, pool_chunked_time, _ in results:
+        report(f"{workers:>2} workers", rows, pool_chunked_time, chunked_time)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+from _fix_path import *
+
+# scripts/bench_single_predict.py
+# p50/p99 latency of the single-prediction hot path: pandas feature prep
+# vs the compiled FeatureEncoder, with and without the model call.
+# Usage: python scripts/bench_single_predict.py [iterations]
+import sys
+import time
+
+from _bench import load_model, percentiles
+from app.ml.features import prepare_features_for_model, feature_encoder
+from app.ml.scoring import AttritionScorer
+from app.routes.predict import EmployeePredictionInput
+
+
+def measure(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    model = load_model()
+    scorer = AttritionScorer(model)
+    data = EmployeePredictionInput(age=34, over_time="Yes", job_role="Sales Representative")
+
+    def pandas_encode():
+        return prepare_features_for_model(data.model_dump())
+
+    def compiled_encode():
+        return feature_encoder.encode(data)
+
+    def pandas_predict():
+        df_model = pandas_encode()
+        model.predict(df_model)
+        model.predict_proba(df_model)
+
+    def compiled_predict():
+        scorer.score_one(compiled_encode())
+
+    cases = [
+        ("encode: prepare_features_for_model", pandas_encode),
+        ("encode: FeatureEncoder", compiled_encode),
+        ("end-to-end: pandas prep + model", pandas_predict),
+        ("end-to-end: encoder + single pass", compiled_predict),
+    ]
+    print(f"{'case':<40} {'p50 ms':>10} {'p99 ms':>10}")
+    for name, fn in cases:
+        measure(fn, 50)  # warm-up
+        p50, p99 = percentiles(measure(fn, iterations), 50, 99)
+        print(f"{name:<40} {p50:>10.3f} {p99:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+from _fix_path import *
+
+# scripts/bench_startup.py
+# Worker startup cost: time to import app.main, time from launching uvicorn
+# until /health answers, the latency of the first prediction, and the
+# worker's resident memory (RSS) at each step. Compares loading the model
+# at startup (MODEL_PRELOAD=true) with loading it on first use (false).
+# Every run is a fresh process against a temp database.
+# Usage: python scripts/bench_startup.py [runs]
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+IMPORT_PROBE = """
+import json, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+rss = 0
+with open("/proc/self/status") as f:
+    for line in f:
+        if line.startswith("VmRSS:"):
+            rss = int(line.split()[1]) * 1024
+print(json.dumps({"seconds": elapsed, "rss": rss}))
+"""
+
+
+def rss_of(pid: int) -> int:
+    """Resident memory of a process in bytes (Linux /proc)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def request(url: str, body: dict = None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=30) as response:
+        return response.read()
+
+
+def environment(preload: bool) -> dict:
+    db = os.path.join(tempfile.mkdtemp(prefix="hr-bench-"), "bench.db")
+    return {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{db}",
+        "MODEL_PRELOAD": "true" if preload else "false",
+        "PYTHONPATH": os.getcwd(),
+    }
+
+
+def measure_import(preload: bool) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        env=environment(preload), capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_server(preload: bool) -> dict:
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=environment(preload), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError("uvicorn exited during startup")
+            try:
+                request(f"{base}/health")
+                break
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+        ready = time.perf_counter() - started
+        rss_ready = rss_of(server.pid)
+
+        predict_started = time.perf_counter()
+        request(f"{base}/api/predict/single", {"age": 35})
+        first_predict = time.perf_counter() - predict_started
+        return {
+            "ready": ready,
+            "first_predict": first_predict,
+            "rss_ready": rss_ready,
+            "rss_predict": rss_of(server.pid),
+        }
+    finally:
+        server.terminate()
+        server.wait(30)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    print(f"Worker startup, median of {runs} runs")
+    print(f"{'mode':<8} {'import':>9} {'RSS':>8} {'/health':>9} {'RSS':>8} {'1st predict':>12} {'RSS':>8}")
+    for label, preload in (("preload", True), ("lazy", False)):
+        imports = [measure_import(preload) for _ in range(runs)]
+        servers = [measure_server(preload) for _ in range(runs)]
+
+        def median(samples, key):
+            return statistics.median(sample[key] for sample in samples)
+
+        print(
+            f"{label:<8} "
+            f"{median(imports, 'seconds') * 1000:7.0f}ms "
+            f"{median(imports, 'rss') / 2**20:6.0f}MB "
+            f"{median(servers, 'ready') * 1000:7.0f}ms "
+            f"{median(servers, 'rss_ready') / 2**20:6.0f}MB "
+            f"{median(servers, 'first_predict') * 1000:10.0f}ms "
+            f"{median(servers, 'rss_predict') / 2**20:6.0f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+from _fix_path import *
+
+# scripts/compact_predictions.py
+# Delete raw prediction rows older than the retention window. Their counts
+# are already in the day/week rollups, which are kept.
+# Usage: python scripts/compact_predictions.py [retention_days]
+import os
+import sys
+from datetime import datetime, timedelta
+
+from sqlmodel import Session
+from app.db.engine import engine, create_db_and_tables
+from app.analytics.prediction_rollup import compact_predictions, ensure_rollups
+
+days = int(sys.argv[1]) if len(sys.argv) > 1 else int(os.getenv("PREDICTION_RETENTION_DAYS", "90"))
+cutoff = datetime.utcnow() - timedelta(days=days)
+
+create_db_and_tables()
+with Session(engine) as s:
+    # Rollups must cover the raw rows before any are deleted
+    ensure_rollups(s)
+    deleted = compact_predictions(s, cutoff)
+
+print(f"✓ Removed {deleted} predictions made before {cutoff:%Y-%m-%d %H:%M} UTC")
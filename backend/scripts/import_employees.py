@@ -0,0 +1,29 @@
+from _fix_path import *
+
+# scripts/import_employees.py
+# Bulk-load employees from a CSV or Parquet file, upserting on employee_number.
+# Usage: python scripts/import_employees.py path/to/employees.csv
+import sys
+
+from sqlmodel import Session
+from app.db.engine import engine, create_db_and_tables
+from app.db.bulk import read_employee_file, upsert_employees
+from app.db.search import ensure_search_index
+
+if len(sys.argv) != 2:
+    print("Usage: python scripts/import_employees.py <file.csv|file.parquet>")
+    sys.exit(1)
+
+path = sys.argv[1]
+create_db_and_tables()
+with open(path, "rb") as f:
+    df = read_employee_file(f, path)
+
+with Session(engine) as s:
+    ensure_search_index(s)
+    result = upsert_employees(s, df)
+
+print(
+    f"✓ {result['total']} employees imported in {result['seconds']}s "
+    f"({result['inserted']} inserted, {result['updated']} updated)"
+)
@@ -0,0 +1,14 @@
+from _fix_path import *
+
+# scripts/rebuild_analytics.py
+# Recompute the materialized analytics snapshot from the employee table.
+# Use after loading employees outside the API or if the counts drift.
+from sqlmodel import Session
+from app.db.engine import engine, create_db_and_tables
+from app.analytics.summary import rebuild_summary
+
+create_db_and_tables()
+with Session(engine) as s:
+    rows = rebuild_summary(s)
+
+print(f"✓ Analytics snapshot rebuilt: {rows} summary rows")
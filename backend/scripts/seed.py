@@ -1,24 +1,19 @@
 from _fix_path import *
 
 # scripts/seed.py
-import pandas as pd
 from sqlmodel import Session
 from app.db.engine import engine
-from app.models.employee import Employee
+from app.db.bulk import read_employee_file, upsert_employees
+from app.db.search import ensure_search_index
 
-# 1. Read CSV
-df = pd.read_csv("data/ibm_hr_attrition.csv")
+# 1. Read CSV and convert column names from PascalCase to snake_case
+with open("data/ibm_hr_attrition.csv", "rb") as f:
+    df = read_employee_file(f, "ibm_hr_attrition.csv")
 
-# 2. Convert column names from PascalCase to snake_case
-df.columns = df.columns.str.replace(r'(?<!^)(?=[A-Z])', '_', regex=True).str.lower()
-
-# 3. Clean
-df = df.replace({"": None, "NA": None})
-
-# 4. Insert
+# 2. Insert (or update on employee_number); this also refreshes the
+#    analytics snapshot and the search index
 with Session(engine) as s:
-    for _, row in df.iterrows():
-        s.add(Employee(**row.to_dict()))
-    s.commit()
+    ensure_search_index(s)
+    result = upsert_employees(s, df)
 
-print("1470 employees loaded!")
\ No newline at end of file
+print(f"{result['total']} employees loaded!")